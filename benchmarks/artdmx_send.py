@@ -0,0 +1,94 @@
+"""Socket calls and CPU time per ArtDmx that ArtNetServer sends, with every universe changing every frame.
+
+Socket calls are counted with an audit hook, so anything that creates, configures or writes to a socket shows up.
+The nodes are on the loopback interface, nothing listens to them.
+
+Run from the repository root: python -m benchmarks.artdmx_send [universes]
+"""
+import asyncio
+import sys
+import time
+from collections import Counter
+from socket import AF_INET, SOCK_DGRAM, socket
+from types import SimpleNamespace
+
+from custom_components.artnet_led.client import PortAddress
+from custom_components.artnet_led.client import artnet_server
+from custom_components.artnet_led.client.artnet_server import ArtNetServer, Node
+
+FRAMES = 1000
+
+
+class NoStore:
+    """The node storage isn't part of what's measured, and would need a full Home Assistant instance."""
+
+    def __init__(self, hass, version, key):
+        pass
+
+    async def async_load(self):
+        return None
+
+    def async_delay_save(self, data_func, delay):
+        pass
+
+
+async def measure(universes: int) -> tuple[float, Counter]:
+    loop = asyncio.get_running_loop()
+    artnet_server.Store = NoStore
+
+    # Nothing to limit the frame rate, and no retransmits; only the changes themselves are sent
+    server = ArtNetServer(SimpleNamespace(loop=loop), polling=False, max_fps=10 ** 6, retransmit_time_ms=0)
+    port_addresses = [PortAddress(0, universe // 16, universe % 16) for universe in range(universes)]
+    for port_address in port_addresses:
+        server.add_port(port_address)
+
+    sock = socket(AF_INET, SOCK_DGRAM)
+    sock.setblocking(False)
+    sock.bind(("127.0.0.1", 0))
+    server._socket = sock
+    await loop.create_datagram_endpoint(lambda: server, sock=sock)
+    server.datagram_received = lambda data, addr: None
+    server._artdmx_task = loop.create_task(server.start_artdmx_loop())
+
+    node = Node(bytes([127, 0, 0, 1]), 1)
+    for port_address in port_addresses:
+        server.add_node_by_port_address(port_address, node)
+    await asyncio.sleep(0.05)
+
+    events = Counter()
+
+    def audit(event, args):
+        if event.startswith("socket."):
+            events[event] += 1
+
+    sys.addaudithook(audit)
+
+    data = bytearray(512)
+    started = time.process_time()
+    for frame in range(FRAMES):
+        data[0] = frame & 0xFF
+        for port_address in port_addresses:
+            server.send_dmx(port_address, bytearray(data))
+        # Once for the ArtDmx loop to wake up, once for it to send
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    elapsed = time.process_time() - started
+
+    # Audit hooks can't be removed, so take what was counted before shutting down
+    counted = Counter(events)
+    server.stop_server()
+    return elapsed, counted
+
+
+def main():
+    universes = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    elapsed, events = asyncio.run(measure(universes))
+
+    artdmx = FRAMES * universes
+    print(f"{universes} universes, {FRAMES} frames: {elapsed / artdmx * 1e6:.1f} us CPU per ArtDmx")
+    for event, count in sorted(events.items()):
+        print(f"  {event:<20} {count / artdmx:.2f} per ArtDmx")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Microbenchmark of PortAddress construction, hashing and dict lookups, as done for every ArtDmx sent or received.
+
+Run from the repository root: python -m benchmarks.port_address
+"""
+import timeit
+
+from custom_components.artnet_led.client import PortAddress
+
+NUMBER = 200_000
+
+
+def main():
+    own_port_addresses = {PortAddress(0, sub_net, universe): None for sub_net in range(4) for universe in range(16)}
+    known = PortAddress(0, 2, 7)
+    known_value = known.port_address
+    unknown_value = PortAddress(3, 0, 0).port_address
+    unsorted = list(own_port_addresses)[::-1]
+
+    cases = {
+        "PortAddress(net, sub_net, universe)": lambda: PortAddress(0, 2, 7),
+        "PortAddress.parse(port_address)": lambda: PortAddress.parse(known_value),
+        "hash(port_address)": lambda: hash(known),
+        "port_address == port_address": lambda: known == PortAddress(0, 2, 7),
+        "dict lookup, parsed from ArtDmx (hit)": lambda: own_port_addresses.get(PortAddress.parse(known_value)),
+        "dict lookup, parsed from ArtDmx (miss)": lambda: own_port_addresses.get(PortAddress.parse(unknown_value)),
+        "sorted(64 port addresses)": lambda: sorted(unsorted),
+    }
+
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=NUMBER, repeat=5))
+        print(f"{name:<40} {seconds / NUMBER * 1e9:8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""CPU time per packet for the ways a frame's batch of ArtDmx packets could be written to the socket.
+
+- transport.sendto: one call per packet through the asyncio datagram transport
+- socket.sendto: one call per packet straight to the socket, as ArtNetServer._send_batch does
+- sendmmsg: the whole batch in one system call, through ctypes (Linux only)
+
+Run from the repository root: python -m benchmarks.sendto_batch [packets per batch]
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import struct
+import sys
+import time
+from socket import AF_INET, SOCK_DGRAM, inet_aton, socket
+
+ROUNDS = 2000
+DESTINATION = ("127.0.0.1", 40000)
+
+# struct mmsghdr and struct iovec, on 64 bit Linux
+MMSGHDR = struct.Struct("@PI4xPNPNi4xI4x")
+IOVEC = struct.Struct("@PN")
+
+
+def per_packet(send_batch, batch) -> float:
+    for _ in range(50):
+        send_batch(batch)
+    started = time.process_time()
+    for _ in range(ROUNDS):
+        send_batch(batch)
+    return (time.process_time() - started) / ROUNDS / len(batch)
+
+
+def sendmmsg_sender(sock: socket, capacity: int):
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    sendmmsg = libc.sendmmsg
+    sendmmsg.restype = ctypes.c_int
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+
+    headers = bytearray(MMSGHDR.size * capacity)
+    vectors = bytearray(IOVEC.size * capacity)
+    headers_address = ctypes.addressof((ctypes.c_char * len(headers)).from_buffer(headers))
+    vectors_address = ctypes.addressof((ctypes.c_char * len(vectors)).from_buffer(vectors))
+
+    # Building the sockaddr and finding each buffer's address is cached, as a real implementation would
+    sockaddrs = {}
+    buffers = {}
+
+    def sockaddr(addr) -> int:
+        buffer = sockaddrs.get(addr)
+        if buffer is None:
+            raw = struct.pack("=H", AF_INET) + struct.pack("!H", addr[1]) + inet_aton(addr[0]) + bytes(8)
+            buffer = sockaddrs[addr] = ctypes.create_string_buffer(raw, len(raw))
+        return ctypes.addressof(buffer)
+
+    def address_of(packet: bytearray) -> int:
+        cached = buffers.get(id(packet))
+        if cached is None or cached[0] is not packet:
+            cached = buffers[id(packet)] = (packet, ctypes.addressof((ctypes.c_char * len(packet)).from_buffer(packet)))
+        return cached[1]
+
+    fd = sock.fileno()
+
+    def send_batch(batch):
+        for i, (packet, addr) in enumerate(batch):
+            IOVEC.pack_into(vectors, i * IOVEC.size, address_of(packet), len(packet))
+            MMSGHDR.pack_into(headers, i * MMSGHDR.size, sockaddr(addr), 16, vectors_address + i * IOVEC.size, 1,
+                              0, 0, 0, 0)
+        sent = sendmmsg(fd, headers_address, len(batch), 0)
+        if sent != len(batch):
+            raise OSError(ctypes.get_errno(), "sendmmsg sent only part of the batch")
+
+    return send_batch
+
+
+async def measure(packets: int) -> dict[str, float]:
+    loop = asyncio.get_running_loop()
+    sock = socket(AF_INET, SOCK_DGRAM)
+    sock.setblocking(False)
+    transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol, sock=sock)
+
+    # A full universe each, the size of an ArtDmx with 512 channels
+    batch = [(bytearray(530), DESTINATION) for _ in range(packets)]
+
+    def through_transport(batch):
+        for packet, addr in batch:
+            transport.sendto(packet, addr)
+
+    def through_socket(batch):
+        sendto = sock.sendto
+        for packet, addr in batch:
+            sendto(packet, addr)
+
+    results = {
+        "transport.sendto": per_packet(through_transport, batch),
+        "socket.sendto": per_packet(through_socket, batch),
+    }
+    if sys.platform.startswith("linux") and struct.calcsize("P") == 8:
+        results["sendmmsg"] = per_packet(sendmmsg_sender(sock, packets), batch)
+
+    transport.close()
+    return results
+
+
+def main():
+    packets = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    results = asyncio.run(measure(packets))
+
+    print(f"Batches of {packets} packets:")
+    for name, seconds in results.items():
+        print(f"  {name:<20} {seconds * 1e6:6.2f} us CPU per packet")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,14 +18,16 @@ HA_OEM = 0x2BE9
 
 class ArtNetController(BaseNode):
 
-    def __init__(self, hass: HomeAssistant, max_fps: int = 25, refresh_every: float = 2):
+    def __init__(self, hass: HomeAssistant, max_fps: int = 25, refresh_every: float = 2, sync: bool = False,
+                 interface: str | None = None):
         super().__init__("", 0, max_fps=max_fps, refresh_every=0, start_refresh_task=False)
 
         self._hass = hass
 
         self.__server = ArtNetServer(hass, state_update_callback=self.update_dmx_data, oem=HA_OEM,
                                      short_name="ha-artnet-led", long_name="HomeAssistant ArtNet integration",
-                                     retransmit_time_ms=int(refresh_every * 1000.0)
+                                     retransmit_time_ms=int(refresh_every * 1000.0), sync=sync, max_fps=max_fps,
+                                     max_input_fps=max_fps, interface=interface
                                      )
 
     def _send_universe(self, id: int, byte_size: int, values: bytearray, universe: BaseUniverse):
@@ -45,6 +47,10 @@ class ArtNetController(BaseNode):
         self.__server.add_port(PortAddress.parse(nr))
         return dmx_universe
 
+    def set_refresh_every(self, nr: int, refresh_every: float):
+        refresh_policy = self.__server.default_refresh_policy(int(refresh_every * 1000.0))
+        self.__server.set_refresh_policy(PortAddress.parse(nr), refresh_policy)
+
     def start(self):
         return self.__server.start_server()
 
@@ -0,0 +1,46 @@
+import logging
+from asyncio import get_running_loop
+from typing import Union, Optional, Tuple
+
+import pyartnet
+from pyartnet import ArtNetNode
+
+from custom_components.artnet_led.client import ArtSync
+
+log = logging.getLogger(__name__)
+
+
+class ArtNetDirectNode(ArtNetNode):
+    """pyartnet's ArtNetNode, which can follow up every batch of universes with an ArtSync."""
+
+    def __init__(self, ip: str, port: int, *,
+                 max_fps: int = 25,
+                 refresh_every: Union[int, float, None] = 2, start_refresh_task: bool = True,
+                 source_address: Optional[Tuple[str, int]] = None,
+                 sequence_counter: bool = True,
+                 sync: bool = False):
+        super().__init__(ip, port, max_fps=max_fps, refresh_every=refresh_every,
+                         start_refresh_task=start_refresh_task, source_address=source_address,
+                         sequence_counter=sequence_counter)
+
+        self._sync = sync
+        self._sync_scheduled = False
+        self._sync_packet = bytes(ArtSync().serialize())
+
+    def _send_sync(self):
+        log.debug(f"Sending ArtSync to {self._ip}")
+        self._socket.sendto(self._sync_packet, self._dst)
+
+    def _send_universe(self, id: int, byte_size: int, values: bytearray,
+                       universe: 'pyartnet.impl_artnet.ArtNetUniverse'):
+        super()._send_universe(id, byte_size, values, universe)
+
+        # pyartnet sends all universes of a process tick or refresh round back to back, without yielding. One ArtSync
+        # after the loop gets to run again therefore follows the whole batch.
+        if self._sync and not self._sync_scheduled:
+            self._sync_scheduled = True
+            get_running_loop().call_soon(self._flush_sync)
+
+    def _flush_sync(self):
+        self._sync_scheduled = False
+        self._send_sync()
@@ -1,16 +1,21 @@
-import datetime
+import copy
+import functools
 import logging
-import re
+import struct
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional
 
 CLIENT_VERSION = 1
 
 PROTOCOL_VERSION = 0x000E
 PORT = 0x1936
+ART_NET_HEADER = b"Art-Net\0"
 HOME_ASSISTANT_ESTA = ord('H') << 8 + ord('A')
 
+# Anything supporting the buffer protocol, deserializers read straight from the received datagram
+Buffer = bytes | bytearray | memoryview
+
 log = logging.getLogger(__name__)
 
 
@@ -108,41 +113,84 @@ class StyleCode(Enum):
     # @formatter:on
 
 
-@dataclass(order=True)
 class PortAddress:
-    net: int = 0
-    sub_net: int = 0
-    universe: int = 0
+    """An immutable port address, backed by its packed integer.
 
-    def __init__(self, net: int, sub_net: int, universe: int = 0) -> None:
-        super().__init__()
+    Instances are interned, so there is only ever one instance per port address and hashing, equality and ordering are
+    all plain integer operations.
+    """
+    __slots__ = ("net", "sub_net", "universe", "port_address")
+
+    __interned: dict[int, "PortAddress"] = {}
+
+    def __new__(cls, net: int, sub_net: int, universe: int = 0) -> "PortAddress":
         assert (0 <= net <= 0xF)
         assert (0 <= sub_net <= 0xF)
         assert (0 <= universe <= 0x1FF)
-        self.net = net
-        self.sub_net = sub_net
-        self.universe = universe
+        port_address = (net << 13) | (sub_net << 9) | universe
+
+        instance = PortAddress.__interned.get(port_address)
+        if instance is None:
+            instance = object.__new__(cls)
+            object.__setattr__(instance, "net", net)
+            object.__setattr__(instance, "sub_net", sub_net)
+            object.__setattr__(instance, "universe", universe)
+            object.__setattr__(instance, "port_address", port_address)
+            PortAddress.__interned[port_address] = instance
+        return instance
 
-    @property
-    def port_address(self):
-        return (self.net << 13) | (self.sub_net << 9) | self.universe
+    @staticmethod
+    def parse(port_address: int) -> "PortAddress":
+        port_address &= 0x1FFFF
+        instance = PortAddress.__interned.get(port_address)
+        if instance is None:
+            instance = PortAddress(port_address >> 13 & 0xF, port_address >> 9 & 0xF, port_address & 0x1FF)
+        return instance
 
-    @port_address.setter
-    def port_address(self, port_address):
-        self.net = port_address >> 13 & 0xF
-        self.sub_net = port_address >> 9 & 0xF
-        self.universe = port_address & 0x1FF
+    def __setattr__(self, name, value):
+        raise AttributeError(f"PortAddress is immutable, can't set {name}")
 
-    @staticmethod
-    def parse(port_address: int):
-        return PortAddress(port_address >> 13 & 0xF, port_address >> 9 & 0xF, port_address & 0x1FF)
+    def __delattr__(self, name):
+        raise AttributeError(f"PortAddress is immutable, can't delete {name}")
+
+    def __reduce__(self):
+        return PortAddress.parse, (self.port_address,)
 
     def __str__(self):
         return f"{self.net}:{self.sub_net}:{self.universe}"
 
+    def __repr__(self):
+        return f"PortAddress(net={self.net}, sub_net={self.sub_net}, universe={self.universe})"
+
     def __hash__(self):
         return self.port_address
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, PortAddress):
+            return NotImplemented
+        return self.port_address == other.port_address
+
+    def __lt__(self, other):
+        if not isinstance(other, PortAddress):
+            return NotImplemented
+        return self.port_address < other.port_address
+
+    def __le__(self, other):
+        if not isinstance(other, PortAddress):
+            return NotImplemented
+        return self.port_address <= other.port_address
+
+    def __gt__(self, other):
+        if not isinstance(other, PortAddress):
+            return NotImplemented
+        return self.port_address > other.port_address
+
+    def __ge__(self, other):
+        if not isinstance(other, PortAddress):
+            return NotImplemented
+        return self.port_address >= other.port_address
 
 
 class IndicatorState(Enum):
@@ -251,8 +299,6 @@ class Port:
     rdm_enabled: bool = False
     output_continuous: bool = True
 
-    last_input_seen: datetime = datetime.datetime.now()
-
     @property
     def port_types_flags(self) -> int:
         return (self.output << 7) \
@@ -377,136 +423,115 @@ class TimeCodeType(Enum):
 class ArtBase:
     __ENCODINGS__ = ['utf8', 'iso-8859-1']
 
+    # Every packet's layout is big-endian and starts with this header. The opcode, and the few other fields that
+    # Art-Net sends little-endian, are byte-swapped with _swap_int.
+    _HEADER = struct.Struct(">8sH")
+
     def __init__(self, opcode: OpCode) -> None:
         super().__init__()
         self.__opcode = opcode
 
     def serialize(self) -> bytearray:
-        packet = bytearray()
-        packet.extend(map(ord, "Art-Net\0"))
-        self._append_int_lsb(packet, self.__opcode.value)
+        return self._pack(ArtBase._HEADER)
+
+    def deserialize(self, packet: Buffer) -> int:
+        self._unpack(ArtBase._HEADER, packet)
+        return ArtBase._HEADER.size
+
+    def copy(self):
+        """A shallow copy that owns its payload, rather than viewing into the datagram it was deserialized from."""
+        clone = copy.copy(self)
+        for name, value in vars(clone).items():
+            if isinstance(value, memoryview):
+                setattr(clone, name, value.tobytes())
+        return clone
+
+    def _pack(self, layout: struct.Struct, *fields, payload: Iterable[int] = b"") -> bytearray:
+        """A new packet with the header and the fields packed into it, followed by the variable length payload."""
+        packet = bytearray(layout.size)
+        layout.pack_into(packet, 0, ART_NET_HEADER, self._swap_int(self.__opcode.value), *fields)
+        packet.extend(payload)
         return packet
 
-    def deserialize(self, packet: bytearray) -> int:
-        packet_header, index = self._consume_str(packet, 0, 8)
-        if packet_header != "Art-Net":
-            raise SerializationException(f"Not a valid packet, expected \"Art-Net\", but is \"{packet_header}\"")
+    def _unpack(self, layout: struct.Struct, packet: Buffer, min_size: int | None = None) -> list:
+        """The fields after the header. Packets down to min_size bytes are accepted, reading missing fields as 0."""
+        if len(packet) < layout.size:
+            if min_size is None or len(packet) < min_size:
+                raise SerializationException(f"Not enough bytes in packet: {bytes(packet).hex()}")
+            packet = bytes(packet).ljust(layout.size, b"\0")
+
+        header, opcode, *fields = layout.unpack_from(packet)
+        if header != ART_NET_HEADER:
+            raise SerializationException(f"Not a valid packet, expected \"Art-Net\", but is \"{header}\"")
 
-        opcode, index = self._consume_int_lsb(packet, index)
+        opcode = self._swap_int(opcode)
         if opcode != self.__opcode.value:
             raise SerializationException(f"Expected this packet to have opcode {self.__opcode}, but was {opcode}")
 
-        return index
-
-    @staticmethod
-    def _pop(packet: bytearray, index: int) -> (int, int):
-        return packet[index], index + 1
-
-    @staticmethod
-    def _take(packet: bytearray, n: int, index: int) -> (int, int):
-        return packet[index:index + n], index + n
-
-    @staticmethod
-    def _append_int_lsb(packet: bytearray, number: int):
-        packet.append(number & 0xFF)
-        packet.append(number >> 8 & 0xFF)
-
-    @staticmethod
-    def _append_int_msb(packet: bytearray, number: int):
-        packet.append(number >> 8 & 0xFF)
-        packet.append(number & 0xFF)
-
-    @staticmethod
-    def _consume_int_lsb(packet: bytearray, index: int) -> (int, int):
-        if len(packet) < (index + 2):
-            raise SerializationException(f"Not enough bytes in packet: {bytes(packet).hex()}")
-        [lsb, msb] = packet[index:index + 2]
-        return (msb << 8) | lsb, index + 2
-
-    @staticmethod
-    def _consume_int_msb(packet: bytearray, index: int) -> (int, int):
-        if len(packet) < (index + 2):
-            raise SerializationException(f"Not enough bytes in packet: {bytes(packet).hex()}")
-        [msb, lsb] = packet[index:index + 2]
-        return (msb << 8) | lsb, index + 2
+        return fields
 
     @staticmethod
-    def _consume_hex_number_lsb(packet: bytearray, index: int) -> (int, int):
-        if len(packet) < (index + 2):
-            raise SerializationException(f"Not enough bytes in packet: {bytes(packet).hex()}")
-        lower = hex(packet[index])[2:].zfill(2)
-        upper = hex(packet[index + 1])[2:].zfill(2)
-        return int(upper + lower, 16), index + 2
+    def _swap_int(number: int) -> int:
+        return (number & 0xFF) << 8 | number >> 8 & 0xFF
 
     @staticmethod
-    def _consume_hex_number_msb(packet: bytearray, index: int) -> (int, int):
-        if len(packet) < (index + 2):
-            raise SerializationException(f"Not enough bytes in packet: {bytes(packet).hex()}")
-        upper = hex(packet[index])[2:].zfill(2)
-        lower = hex(packet[index + 1])[2:].zfill(2)
-        return int(upper + lower, 16), index + 2
+    def _encode_str(text: str, length: int) -> bytes:
+        # Always NUL terminated; struct pads it with NULs up to the field's length
+        return text[:length - 1].encode('iso-8859-1')
 
     @staticmethod
-    def _append_str(packet: bytearray, text: str, length: int):
-        cut_text: str = text[:length - 1]
-        padded_text = cut_text.ljust(length, '\0')
-        packet.extend(map(ord, padded_text))
+    def _decode_str(raw_string_from_packet: Buffer) -> Optional[str]:
+        raw_string = bytes(raw_string_from_packet)
 
-    @staticmethod
-    def _consume_str(packet: bytearray, index: int, length: int) -> (Optional[str], int):
-        decoded_str: Optional[str] = None
-        raw_string_from_packet = packet[index:index + length]
-
-        # assume the data is ascii
+        # if there is a NUL character in the bytes, it terminates earlier
+        end = raw_string.find(0)
+        if end >= 0:
+            raw_string = raw_string[:end]
         try:
-            # if there is a NUL character in the bytearry, it terminates earlier
-            nul_terminator = re.compile(b"([^\\x00]+)")
-
-            terminated_string = nul_terminator.match(raw_string_from_packet).group(1)  \
-                if nul_terminator.match(raw_string_from_packet) else raw_string_from_packet
-
-            # remove every other control character
-            sanitized_str = re.sub(b"[^\x00-\x7F]",b"", terminated_string)
-
-            # decode
-            decoded_str = sanitized_str.decode('ascii')
-            log.info(f"decoded string: {decoded_str}")
-
+            return raw_string.decode('ascii')
         except UnicodeDecodeError:
             # data not ascii, try to use the decoding shotgun
-            decoded_str = ArtBase._decode_bytes(raw_string_from_packet)
+            return ArtBase._decode_bytes(raw_string)
 
-        # check if decoding has failed
-        if decoded_str is None:
-            log.error("Unable to convert bytes to string: {raw_hex}".format(raw_hex=bytes(raw_string_from_packet).hex()))
+    @staticmethod
+    def _decode_name(raw_name_from_packet: Buffer) -> Optional[str]:
+        # Node names repeat every poll, so they're decoded once and every reply shares the same str instance
+        return ArtBase.__decode_name(bytes(raw_name_from_packet))
 
-        return decoded_str, index + length
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def __decode_name(raw_name: bytes) -> Optional[str]:
+        return ArtBase._decode_str(raw_name)
 
     @staticmethod
-    def _decode_bytes(byte_str: bytearray) -> Optional[str]:
+    def _decode_bytes(byte_str: bytes) -> Optional[str]:
         for encoding in ArtBase.__ENCODINGS__:
             try:
-                decoded_str = byte_str.decode(encoding)
-                sanitized_str = str(decoded_str).strip().strip('\x00')
-                log.debug(f"decoded as {encoding}: {sanitized_str}")
-                return sanitized_str
-            except UnicodeDecodeError as e:
-                log.warning(f"failed ({e.reason}) to decode as {encoding}: {bytes(byte_str).hex()}")
+                return byte_str.decode(encoding).strip()
+            except UnicodeDecodeError:
+                pass
+
+        log.error(f"Unable to convert bytes to string: {byte_str.hex()}")
+        return None
 
     @staticmethod
-    def peek_opcode(packet: bytearray) -> OpCode | None:
-        if len(packet) < 9:
+    def peek_opcode(packet: Buffer) -> OpCode | None:
+        if len(packet) < ArtBase._HEADER.size:
             return None
 
-        header = packet[0:8]
-        if header != b'Art-Net\x00':
+        header, opcode = ArtBase._HEADER.unpack_from(packet)
+        if header != ART_NET_HEADER:
             return None
 
-        opcode = ArtBase._consume_int_lsb(packet, 8)
-        return OpCode(opcode[0])
+        return OpCode(ArtBase._swap_int(opcode))
 
 
 class ArtPoll(ArtBase):
+    # ProtVer, Flags, DiagPriority, TargetPortAddressTop and TargetPortAddressBottom
+    __LAYOUT = struct.Struct(">8sHHBBHH")
+
+    # Art-Net 3 controllers don't send the target port addresses yet
+    __MIN_SIZE = 14
 
     def __init__(self,
                  protocol_version=PROTOCOL_VERSION,
@@ -565,42 +590,36 @@ class ArtPoll(ArtBase):
     @target_port_bounds.setter
     def target_port_bounds(self, bounds: (PortAddress, PortAddress)):
         self.__target_port_bottom = bounds[0]
-        self.__target_port_top = bounds[0]
+        self.__target_port_top = bounds[1]
         self.__enable_targeted_mode = True
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.__protocol_version)
-
         flags = (self.__enable_targeted_mode << 5) \
                 + (self.__enable_vlc_transmission << 4) \
                 + (self.__diag_mode.value << 3) \
                 + (self.__enable_diagnostics << 2) \
                 + (self.notify_on_change << 1)
 
-        packet.append(flags)
-        packet.append(self.__diag_priority.value)
-        self._append_int_msb(packet, self.__target_port_top.port_address)
-        self._append_int_msb(packet, self.__target_port_bottom.port_address)
-        return packet
+        return self._pack(ArtPoll.__LAYOUT, self.__protocol_version, flags, self.__diag_priority.value,
+                          self.__target_port_top.port_address & 0xFFFF,
+                          self.__target_port_bottom.port_address & 0xFFFF)
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.__protocol_version, index = self._consume_int_msb(packet, index)
+            self.__protocol_version, flags, diag_priority, top, bottom = \
+                self._unpack(ArtPoll.__LAYOUT, packet, ArtPoll.__MIN_SIZE)
+            index = ArtPoll.__LAYOUT.size
 
-            flags, index = self._pop(packet, index)
             self.__enable_targeted_mode = bool(flags >> 5 & 1)
             self.__enable_vlc_transmission = bool(flags >> 4 & 1)
             self.__diag_mode = DiagnosticsMode(bool(flags >> 3 & 1))
             self.__enable_diagnostics = bool(flags >> 2 & 1)
             self.notify_on_change = bool(flags >> 1 & 1)
 
-            self.__diag_priority = DiagnosticsPriority(packet[index])
-            index += 1
-            self.__target_port_top.port_address, index = self._consume_int_msb(packet, index)
-            self.__target_port_bottom.port_address, index = self._consume_int_msb(packet, index)
+            self.__diag_priority = DiagnosticsPriority(diag_priority)
+            self.__target_port_top = PortAddress.parse(top)
+            self.__target_port_bottom = PortAddress.parse(bottom)
         except SerializationException as e:
             print(e)
 
@@ -608,6 +627,22 @@ class ArtPoll(ArtBase):
 
 
 class ArtPollReply(ArtBase):
+    # Offsets into the serialized packet, for patching a pre-serialized ArtPollReply in place, or peeking into one
+    SOURCE_IP_OFFSET = 10
+    NODE_REPORT_OFFSET = 108
+    NODE_REPORT_LENGTH = 64
+    BIND_INDEX_OFFSET = 211
+
+    # IP, port, firmware, net/sub switch, OEM, UBEA, Status1, ESTA, names and node report, port count, the 5 port
+    # arrays, AcnPriority, SwMacro, SwRemote, Style, MAC, BindIp, BindIndex, Status2, GoodOutputB, Status3 and
+    # DefaultRespUID
+    __LAYOUT = struct.Struct(">8sH4sHHBBHBBH18s64s64sH4s4s4s4s4sBBB3xB6s4sBB4sB6s15x")
+
+    # Earlier versions of Art-Net sent shorter replies
+    __MIN_SIZE = 207
+
+    __STYLE_CODES = {style.value[0]: style for style in StyleCode}
+
     def __init__(self,
                  source_ip: bytes = bytes([0x00] * 4),
                  firmware_version: int = 0,
@@ -666,7 +701,7 @@ class ArtPollReply(ArtBase):
         self.node_report = node_report
 
         assert len(ports) <= 4
-        self.ports = ports
+        self.ports = list(ports)
         for i in range(4 - len(ports)):
             self.ports.append(Port())
 
@@ -723,44 +758,11 @@ class ArtPollReply(ArtBase):
         self.__default_resp_uid = default_resp_uid
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        packet.extend(self.source_ip)
-
-        port_str = hex(self.port)[2:]
-        packet.extend([int(port_str[2:4], 16), int(port_str[0:2], 16)])
-
-        self._append_int_msb(packet, self.firmware_version)
-        packet.append(self.net_switch)
-        packet.append(self.sub_switch)
-        self._append_int_msb(packet, self.oem)
-        packet.append(self.ubea or 0x00)
-
         status1 = (self.indicator_state.value << 6) \
                   + (self.port_address_programming_authority.value << 4) \
                   + (self.boot_process.value << 2) \
                   + (self.supports_rdm < 1) \
                   + self.__ubea_present
-        packet.append(status1)
-
-        self._append_int_lsb(packet, self.esta)
-        self._append_str(packet, self.short_name, 18)
-        self._append_str(packet, self.long_name, 64)
-        self._append_str(packet, self.node_report, 64)
-
-        self._append_int_msb(packet, len([p for p in self.ports if p.input or p.output]))
-        packet.extend([p.port_types_flags for p in self.ports])
-        packet.extend([p.good_input.flags for p in self.ports])
-        packet.extend([p.good_output_a.flags for p in self.ports])
-        packet.extend([p.sw_in for p in self.ports])
-        packet.extend([p.sw_out for p in self.ports])
-        packet.append(self.acn_priority)
-        packet.append(self.sw_macro_bitmap)
-        packet.append(self.sw_remote_bitmap)
-        packet.extend([0, 0, 0])
-        packet.append(self.style.value[0])
-        packet.extend(self.mac_address)
-        packet.extend(self.bind_ip)
-        packet.append(self.bind_index)
 
         status2 = self.supports_web_browser_configuration \
                   + (self.dhcp_configured << 1) \
@@ -770,67 +772,57 @@ class ArtPollReply(ArtBase):
                   + (self.squawking << 5) \
                   + (self.supports_switching_of_output_style << 6) \
                   + (self.supports_rdm_through_artnet << 7)
-        packet.append(status2)
-
-        packet.extend(map(lambda p: p.good_output_b, self.ports))
 
         status3 = (self.failsafe_state.value << 6) \
                   + (self.supports_failover << 5) \
                   + (self.__supports_llrp << 4) \
                   + (self.supports_switching_port_direction < 3)
-        packet.append(status3)
-        packet.extend(self.default_resp_uid)
 
-        packet.extend([0x0] * 15)
+        ports = self.ports
+        return self._pack(
+            ArtPollReply.__LAYOUT, self.source_ip, self._swap_int(self.port), self.firmware_version,
+            self.net_switch, self.sub_switch, self.oem, self.ubea or 0x00, status1, self._swap_int(self.esta),
+            self._encode_str(self.short_name, 18), self._encode_str(self.long_name, 64),
+            self._encode_str(self.node_report, ArtPollReply.NODE_REPORT_LENGTH),
+            len([p for p in ports if p.input or p.output]), bytes([p.port_types_flags for p in ports]),
+            bytes([p.good_input.flags for p in ports]), bytes([p.good_output_a.flags for p in ports]),
+            bytes([p.sw_in for p in ports]), bytes([p.sw_out for p in ports]), self.acn_priority,
+            self.sw_macro_bitmap, self.sw_remote_bitmap, self.style.value[0], self.mac_address, self.bind_ip,
+            self.bind_index, status2, bytes([p.good_output_b for p in ports]), status3, bytes(self.default_resp_uid)
+        )
 
-        return packet
+    @staticmethod
+    def patch_node_report(packet: bytearray, node_report: str):
+        offset = ArtPollReply.NODE_REPORT_OFFSET
+        packet[offset:offset + ArtPollReply.NODE_REPORT_LENGTH] = \
+            ArtBase._encode_str(node_report, ArtPollReply.NODE_REPORT_LENGTH).ljust(ArtPollReply.NODE_REPORT_LENGTH,
+                                                                                   b"\0")
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-
-            self.source_ip, index = self._take(packet, 4, index)
+            (self.source_ip, port, self.firmware_version, self.net_switch, self.sub_switch, self.oem, self.ubea,
+             status1, esta, short_name, long_name, node_report, port_count, port_type_flags, good_input_flags,
+             good_output_a_flags, sw_ins, sw_outs, self.acn_priority, self.sw_macro_bitmap, self.sw_remote_bitmap,
+             style, self.mac_address, self.bind_ip, self.bind_index, status2, good_output_b_flags, status3,
+             self.default_resp_uid) = self._unpack(ArtPollReply.__LAYOUT, packet, ArtPollReply.__MIN_SIZE)
+            index = min(len(packet), ArtPollReply.__LAYOUT.size)
 
-            self.port, index = self._consume_hex_number_lsb(packet, index)
-            self.firmware_version, index = self._consume_hex_number_msb(packet, index)
+            self.port = self._swap_int(port)
 
-            self.net_switch, index = self._pop(packet, index)
-            self.sub_switch, index = self._pop(packet, index)
-            self.oem, index = self._consume_hex_number_msb(packet, index)
-            self.ubea, index = self._pop(packet, index)
-
-            status1, index = self._pop(packet, index)
             self.indicator_state = IndicatorState(status1 >> 6 & 2)
             self.port_address_programming_authority = PortAddressProgrammingAuthority(status1 >> 4 & 2)
             self.boot_process = BootProcess(bool(status1 >> 2 & 1))
             self.supports_rdm = bool(status1 >> 1 & 1)
             self.__ubea_present = bool(status1 & 1)
 
-            self.esta, index = self._consume_hex_number_lsb(packet, index)
-            self.short_name, index = self._consume_str(packet, index, 18)
-            self.long_name, index = self._consume_str(packet, index, 64)
-            self.node_report, index = self._consume_str(packet, index, 64)
-
-            port_count, index = self._consume_int_msb(packet, index)
-            port_type_flags, index = self._take(packet, 4, index)
-            good_input_flags, index = self._take(packet, 4, index)
-            good_output_a_flags, index = self._take(packet, 4, index)
-            sw_ins, index = self._take(packet, 4, index)
-            sw_outs, index = self._take(packet, 4, index)
+            self.esta = self._swap_int(esta)
+            self.short_name = self._decode_name(short_name)
+            self.long_name = self._decode_name(long_name)
+            self.node_report = self._decode_str(node_report)
 
-            self.acn_priority, index = self._pop(packet, index)  # Used to be SwVideo
-            self.sw_macro_bitmap, index = self._pop(packet, index)
-            self.sw_remote_bitmap, index = self._pop(packet, index)
+            self.style = ArtPollReply.__STYLE_CODES.get(style, self.style)
 
-            index += 3
-
-            self.style, index = self._pop(packet, index)
-            self.mac_address, index = self._take(packet, 6, index)
-            self.bind_ip, index = self._take(packet, 4, index)
-            self.bind_index, index = self._pop(packet, index)
-
-            status2, index = self._pop(packet, index)
             self.supports_web_browser_configuration = bool(status2 & 1)
             self.dhcp_configured = bool(status2 >> 1 & 1)
             self.dhcp_capable = bool(status2 >> 2 & 1)
@@ -840,9 +832,8 @@ class ArtPollReply(ArtBase):
             self.supports_switching_of_output_style = bool(status2 >> 6 & 1)
             self.supports_rdm_through_artnet = bool(status2 >> 7 & 1)
 
-            good_output_b_flags, index = self._take(packet, 4, index)
-
-            for i in range(port_count):
+            self.ports = [Port() for _ in range(4)]
+            for i in range(min(port_count, 4)):
                 port = self.ports[i]
                 port.port_types_flags = port_type_flags[i]
                 port.good_input.flags = good_input_flags[i]
@@ -851,21 +842,18 @@ class ArtPollReply(ArtBase):
                 port.sw_out = sw_outs[i]
                 port.good_output_b = good_output_b_flags[i]
 
-            status3, index = self._pop(packet, index)
             self.failsafe_state = FailsafeState(status3 >> 6)
             self.supports_failover = bool(status3 >> 5 & 1)
             self.__supports_llrp = bool(status3 >> 4 & 1)
             self.supports_switching_port_direction = bool(status3 >> 3 & 1)
-
-            self.default_resp_uid, index = self._take(packet, 6, index)
-
-            index += 15
         except SerializationException as e:
             print(e)
         return index
 
 
 class ArtIpProg(ArtBase):
+    # ProtVer, Command, ProgIp, ProgSm and ProgDg
+    __LAYOUT = struct.Struct(">8sHH2xBx4s4s2x4s4x")
 
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
@@ -887,35 +875,20 @@ class ArtIpProg(ArtBase):
         self.prog_gateway = prog_gateway
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        packet.extend([0x00] * 2)
-        packet.append(self.command.flags)
-        packet.append(0x00)
-        packet.extend(self.prog_ip)
-        packet.extend(self.prog_subnet)
-        packet.extend([0x00] * 2)
-        packet.extend(self.prog_gateway)
-        packet.extend([0x00] * 4)
-        return packet
+        return self._pack(ArtIpProg.__LAYOUT, self.protocol_version, self.command.flags, self.prog_ip,
+                          self.prog_subnet, self.prog_gateway)
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
+            self.protocol_version, command_flags, self.prog_ip, self.prog_subnet, self.prog_gateway = \
+                self._unpack(ArtIpProg.__LAYOUT, packet)
             if self.protocol_version != 14:
                 raise SerializationException("Protocol is not 14!")
+            index = ArtIpProg.__LAYOUT.size
 
-            index += 2
-            self.command.flags, index = self._pop(packet, index)
-            index += 1
-            self.prog_ip, index = self._take(packet, 4, index)
-            self.prog_subnet, index = self._take(packet, 4, index)
-            index += 2
-            self.prog_gateway, index = self._take(packet, 4, index)
-
-            index += 4
+            self.command = ArtIpProgCommand()
+            self.command.flags = command_flags
         except SerializationException as e:
             print(e)
 
@@ -923,6 +896,8 @@ class ArtIpProg(ArtBase):
 
 
 class ArtIpProgReply(ArtBase):
+    # ProtVer, ProgIp, ProgSm, Status and ProgDg
+    __LAYOUT = struct.Struct(">8sHH4x4s4s2xBx4s2x")
 
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
@@ -944,38 +919,19 @@ class ArtIpProgReply(ArtBase):
         self.dhcp_enabled = dhcp_enabled
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        packet.extend([0x00] * 4)
-        packet.extend(self.prog_ip)
-        packet.extend(self.prog_subnet)
-        packet.extend([0x00] * 2)
-        packet.append(self.dhcp_enabled << 6)
-        packet.append(0x00)
-        packet.extend(self.prog_gateway)
-        packet.extend([0x00] * 2)
-        return packet
+        return self._pack(ArtIpProgReply.__LAYOUT, self.protocol_version, self.prog_ip, self.prog_subnet,
+                          self.dhcp_enabled << 6, self.prog_gateway)
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
+            self.protocol_version, self.prog_ip, self.prog_subnet, status, self.prog_gateway = \
+                self._unpack(ArtIpProgReply.__LAYOUT, packet)
             if self.protocol_version != 14:
                 raise SerializationException("Protocol is not 14!")
+            index = ArtIpProgReply.__LAYOUT.size
 
-            index += 4
-            self.prog_ip, index = self._take(packet, 4, index)
-            self.prog_subnet, index = self._take(packet, 4, index)
-            index += 2
-
-            status, index = self._pop(packet, index)
             self.dhcp_enabled = bool(status >> 6 & 1)
-
-            index += 1
-            self.prog_gateway, index = self._take(packet, 4, index)
-
-            index += 2
         except SerializationException as e:
             print(e)
 
@@ -983,6 +939,9 @@ class ArtIpProgReply(ArtBase):
 
 
 class ArtAddress(ArtBase):
+    # ProtVer, NetSwitch, BindIndex, ShortName, LongName, SwIn, SwOut, SubSwitch, AcnPriority and Command
+    __LAYOUT = struct.Struct(">8sHHBB18s64s4s4sBBB")
+
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
                  net_switch: int = 1,
@@ -1034,37 +993,31 @@ class ArtAddress(ArtBase):
         self.command_port_index = command_port_index
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        packet.append(ArtAddress.__apply_value_action(self.net_action, self.net_switch))
-        packet.append(self.bind_index)
-        self._append_str(packet, self.short_name, 18)
-        self._append_str(packet, self.long_name, 64)
-        self.__append_sw_in_out(packet, self.sw_in, self.sw_in_actions)
-        self.__append_sw_in_out(packet, self.sw_out, self.sw_out_actions)
-        packet.append(ArtAddress.__apply_value_action(self.sub_action, self.sub_switch))
-        packet.append(self.acn_priority)
-        packet.append(self.command.apply_port_index(self.command_port_index))
-        return packet
-
-    def deserialize(self, packet: bytearray) -> int:
+        return self._pack(
+            ArtAddress.__LAYOUT, self.protocol_version,
+            ArtAddress.__apply_value_action(self.net_action, self.net_switch), self.bind_index,
+            self._encode_str(self.short_name, 18), self._encode_str(self.long_name, 64),
+            self.__encode_sw_in_out(self.sw_in, self.sw_in_actions),
+            self.__encode_sw_in_out(self.sw_out, self.sw_out_actions),
+            ArtAddress.__apply_value_action(self.sub_action, self.sub_switch), self.acn_priority,
+            self.command.apply_port_index(self.command_port_index)
+        )
+
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
+            (self.protocol_version, net_switch, self.bind_index, short_name, long_name, sw_in, sw_out, sub_switch,
+             self.acn_priority, command_byte) = self._unpack(ArtAddress.__LAYOUT, packet)
             if self.protocol_version != 14:
                 raise SerializationException("Protocol is not 14!")
-
-            self.net_switch, self.net_action, index = self.__consume_value_and_action(packet, index)
-            self.bind_index, index, self._pop(packet, index)
-            self.short_name = self._consume_str(packet, index, 18)
-            self.long_name = self._consume_str(packet, index, 64)
-            self.sw_in, self.sw_in_actions, index = self.__consume_sw_in_out(packet, index)
-            self.sw_out, self.sw_out_actions, index = self.__consume_sw_in_out(packet, index)
-            self.sub_switch, self.sub_action, index = self.__consume_value_and_action(packet, index)
-            self.acn_priority, index = self._pop(packet, index)
-
-            command_byte, index = self._pop(packet, index)
+            index = ArtAddress.__LAYOUT.size
+
+            self.net_switch, self.net_action = self.__decode_value_and_action(net_switch)
+            self.short_name = self._decode_name(short_name)
+            self.long_name = self._decode_name(long_name)
+            self.sw_in, self.sw_in_actions = self.__decode_sw_in_out(sw_in)
+            self.sw_out, self.sw_out_actions = self.__decode_sw_in_out(sw_out)
+            self.sub_switch, self.sub_action = self.__decode_value_and_action(sub_switch)
             self.command, self.command_port_index = ArtAddressCommand.decode_with_port_index(command_byte)
         except SerializationException as e:
             print(e)
@@ -1079,8 +1032,7 @@ class ArtAddress(ArtBase):
             return (action == ValueAction.WRITE) << 7 | value
 
     @staticmethod
-    def __consume_value_and_action(packet: bytearray, index: int) -> (int, ValueAction, int):
-        value = packet[index]
+    def __decode_value_and_action(value: int) -> (int, ValueAction):
         if value == 0x00:
             action = ValueAction.RESET
         elif value >> 7 & 1:
@@ -1088,22 +1040,24 @@ class ArtAddress(ArtBase):
         else:
             action = ValueAction.IGNORE
 
-        return value, action, index + 1
+        return value, action
 
     @staticmethod
-    def __append_sw_in_out(packet: bytearray, sw: list[int], sw_actions: list[ValueAction]):
-        for i in range(4):
-            packet.append(ArtAddress.__apply_value_action(sw_actions[i], sw[i]))
+    def __encode_sw_in_out(sw: list[int], sw_actions: list[ValueAction]) -> bytes:
+        return bytes(ArtAddress.__apply_value_action(sw_actions[i], sw[i]) for i in range(4))
 
     @staticmethod
-    def __consume_sw_in_out(packet: bytearray, index: int) -> (list[int], list[ValueAction], int):
-        sw_action = list(map(lambda i: ArtAddress.__consume_value_and_action(packet, index + i), range(4)))
+    def __decode_sw_in_out(raw: bytes) -> (list[int], list[ValueAction]):
+        sw_action = list(map(ArtAddress.__decode_value_and_action, raw))
         sws = list(map(lambda sw_a: sw_a[0], sw_action))
         actions = list(map(lambda sw_a: sw_a[1], sw_action))
-        return sws, actions, index + 4
+        return sws, actions
 
 
 class ArtDiagData(ArtBase):
+    # ProtVer, DiagPriority, LogicalPort and Length, followed by the NUL terminated text
+    __LAYOUT = struct.Struct(">8sHHxBBxH")
+
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
                  diag_priority: DiagnosticsPriority = DiagnosticsPriority,
@@ -1119,30 +1073,22 @@ class ArtDiagData(ArtBase):
         self.text = text
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        packet.append(0x00)
-        packet.append(self.diag_priority.value)
-        packet.append(self.logical_port)
-        packet.append(0x00)
-        self._append_int_msb(packet, len(self.text))
-        self._append_str(packet, self.text, len(self.text) + 1)
-        return packet
+        text = self._encode_str(self.text, len(self.text) + 1) + b"\0"
+        return self._pack(ArtDiagData.__LAYOUT, self.protocol_version, self.diag_priority.value, self.logical_port,
+                          len(self.text), payload=text)
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
+            self.protocol_version, diag_priority_byte, self.logical_port, text_length = \
+                self._unpack(ArtDiagData.__LAYOUT, packet)
             if self.protocol_version != 14:
                 raise SerializationException("Protocol is not 14!")
-            index += 1
-            diag_priority_byte, index = self._pop(packet, index)
             self.diag_priority = DiagnosticsPriority(diag_priority_byte)
-            self.logical_port, index = self._pop(packet, index)
-            index += 1
-            text_length, index = self._consume_int_msb(packet, index)
-            self.text, index = self._consume_str(packet, index, text_length + 1)
+
+            index = ArtDiagData.__LAYOUT.size
+            self.text = self._decode_str(memoryview(packet)[index:index + text_length + 1])
+            index += text_length + 1
         except SerializationException as e:
             print(e)
 
@@ -1150,6 +1096,9 @@ class ArtDiagData(ArtBase):
 
 
 class ArtTimeCode(ArtBase):
+    # ProtVer, Frames, Seconds, Minutes, Hours and Type
+    __LAYOUT = struct.Struct(">8sHH2xBBBBB")
+
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
                  frames: int = 0,
@@ -1176,31 +1125,19 @@ class ArtTimeCode(ArtBase):
         self.type = type
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        packet.extend([0x00] * 2)
-        packet.append(self.frames)
-        packet.append(self.seconds)
-        packet.append(self.minutes)
-        packet.append(self.hours)
-        packet.append(self.type.value)
-        return packet
+        return self._pack(ArtTimeCode.__LAYOUT, self.protocol_version, self.frames, self.seconds, self.minutes,
+                          self.hours, self.type.value)
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
+            self.protocol_version, self.frames, self.seconds, self.minutes, self.hours, type_byte = \
+                self._unpack(ArtTimeCode.__LAYOUT, packet)
             if self.protocol_version != 14:
                 raise SerializationException("Protocol is not 14!")
-            index += 2
-            self.frames, index = self._pop(packet, index)
-            self.seconds, index = self._pop(packet, index)
-            self.minutes, index = self._pop(packet, index)
-            self.hours, index = self._pop(packet, index)
-
-            type_bytes, index = self._pop(packet, index)
-            self.type = TimeCodeType(type_bytes)
+            index = ArtTimeCode.__LAYOUT.size
+
+            self.type = TimeCodeType(type_byte)
         except SerializationException as e:
             print(e)
 
@@ -1208,6 +1145,9 @@ class ArtTimeCode(ArtBase):
 
 
 class ArtCommand(ArtBase):
+    # ProtVer, EstaMan and the command string
+    __LAYOUT = struct.Struct(">8sHHH512s")
+
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
                  esta: int = 0xFFFF,
@@ -1221,23 +1161,17 @@ class ArtCommand(ArtBase):
         self.command = command
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        self._append_int_msb(packet, self.esta)
-        self._append_str(packet, self.command, 512)
-        return packet
+        return self._pack(ArtCommand.__LAYOUT, self.protocol_version, self.esta, self._encode_str(self.command, 512))
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
+            self.protocol_version, self.esta, command = self._unpack(ArtCommand.__LAYOUT, packet)
             if self.protocol_version != 14:
                 raise SerializationException("Protocol is not 14!")
+            index = ArtCommand.__LAYOUT.size
 
-            self.esta, index = self._consume_int_msb(packet, index)
-            self.command, index = self._consume_str(packet, index, 512)
-
+            self.command = self._decode_str(command)
         except SerializationException as e:
             print(e)
 
@@ -1245,6 +1179,10 @@ class ArtCommand(ArtBase):
 
 
 class ArtTrigger(ArtBase):
+    # ProtVer, OEM, Key and SubKey, followed by the payload
+    __LAYOUT = struct.Struct(">8sHH2xHBB")
+    __PAYLOAD_LENGTH = 512
+
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
                  oem: int = 0xFFFF,
@@ -1262,33 +1200,26 @@ class ArtTrigger(ArtBase):
         self.payload = payload
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        packet.extend([0x00] * 2)
-        self._append_int_msb(packet, self.oem)
-        packet.append(self.key)
-        packet.append(self.sub_key)
-        packet.extend(self.payload)
-        return packet
+        return self._pack(ArtTrigger.__LAYOUT, self.protocol_version, self.oem, self.key, self.sub_key,
+                          payload=self.payload)
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
-            index += 2
-            self.oem, index = self._consume_hex_number_msb(packet, index)
+            self.protocol_version, self.oem, self.key, self.sub_key = self._unpack(ArtTrigger.__LAYOUT, packet)
             if self.protocol_version != 14:
                 raise SerializationException("Protocol is not 14!")
 
-            self.key, index = self._pop(packet, index)
-            self.sub_key, index = self._pop(packet, index)
+            start = ArtTrigger.__LAYOUT.size
+            if len(packet) < start + ArtTrigger.__PAYLOAD_LENGTH:
+                raise SerializationException(f"Not enough bytes in packet: {bytes(packet).hex()}")
+
+            # A view on the payload inside the packet, copy() the ArtTrigger to keep it around
+            index = start + ArtTrigger.__PAYLOAD_LENGTH
+            self.payload = memoryview(packet)[start:index]
 
             if self.oem == 0xFFFF and self.key > 3:
                 print(f"Warning: Trigger key range undefined for OEM '{self.oem}', key '{self.key}'")
-
-            self.payload, index = self._take(packet, index, 512)
-
         except SerializationException as e:
             print(e)
 
@@ -1296,6 +1227,15 @@ class ArtTrigger(ArtBase):
 
 
 class ArtDmx(ArtBase):
+    # Offsets into the serialized packet, for patching a pre-serialized ArtDmx in place
+    SEQUENCE_OFFSET = 12
+    DATA_OFFSET = 18
+
+    # ProtVer, Sequence, Physical, SubUni, Net and Length, followed by the data
+    __LAYOUT = struct.Struct(">8sHHBBBBH")
+
+    # SubUni, Net and Length, the only header fields needed to route received DMX data
+    __ROUTING_HEADER = struct.Struct(">14xBBH")
 
     def __init__(self,
                  protocol_version: int = PROTOCOL_VERSION,
@@ -1320,33 +1260,49 @@ class ArtDmx(ArtBase):
         self.data = data
 
     def serialize(self) -> bytearray:
-        packet = super().serialize()
-        self._append_int_msb(packet, self.protocol_version)
-        packet.append(self.sequence_number)
-        packet.append(self.physical)
-
         port_address = self.port_address.port_address
-        packet.append(port_address & 0x0F)
-        packet.append(port_address >> 8 & 0x0F)
+        return self._pack(ArtDmx.__LAYOUT, self.protocol_version, self.sequence_number, self.physical,
+                          port_address & 0xFF, port_address >> 8 & 0x7F, len(self.data), payload=self.data)
 
-        self._append_int_msb(packet, len(self.data))
-        packet.extend(self.data)
-        return packet
+    @staticmethod
+    def unpack_header(packet: bytes) -> (int, int):
+        """Reads just the 15-bit port address and data length, without validating or copying anything."""
+        sub_uni, net, length = ArtDmx.__ROUTING_HEADER.unpack_from(packet)
+        return net << 8 | sub_uni, length
 
-    def deserialize(self, packet: bytearray) -> int:
+    def deserialize(self, packet: Buffer) -> int:
         index = 0
         try:
-            index = super().deserialize(packet)
-            self.protocol_version, index = self._consume_int_msb(packet, index)
-            self.sequence_number, index = self._pop(packet, index)
-            self.physical, index = self._pop(packet, index)
+            self.protocol_version, self.sequence_number, self.physical, sub_uni, net, data_length = \
+                self._unpack(ArtDmx.__LAYOUT, packet)
+            self.port_address = PortAddress.parse(net << 8 | sub_uni)
+
+            # A view on the data inside the packet, copy() the ArtDmx to keep it around
+            index = ArtDmx.__LAYOUT.size
+            self.data = memoryview(packet)[index:index + data_length]
+            index += data_length
+        except SerializationException as e:
+            print(e)
+
+        return index
+
 
-            sub_uni, index = self._pop(packet, index)
-            net, index = self._pop(packet, index)
-            self.port_address.port_address = net << 8 | sub_uni
+class ArtSync(ArtBase):
+    # ProtVer, Aux1 and Aux2
+    __LAYOUT = struct.Struct(">8sHH2x")
 
-            data_length, index = self._consume_int_msb(packet, index)
-            self.data, index = self._take(packet, data_length, index)
+    def __init__(self, protocol_version: int = PROTOCOL_VERSION) -> None:
+        super().__init__(opcode=OpCode.OP_SYNC)
+        self.protocol_version = protocol_version
+
+    def serialize(self) -> bytearray:
+        return self._pack(ArtSync.__LAYOUT, self.protocol_version)
+
+    def deserialize(self, packet: Buffer) -> int:
+        index = 0
+        try:
+            self.protocol_version, = self._unpack(ArtSync.__LAYOUT, packet)
+            index = ArtSync.__LAYOUT.size
         except SerializationException as e:
             print(e)
 
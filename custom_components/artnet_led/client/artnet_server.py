@@ -2,24 +2,64 @@ import asyncio
 import datetime
 import logging
 import random
+import time
 import uuid
+import zlib
 from asyncio import transports, Task
 from dataclasses import dataclass, field
-from socket import socket
 from typing import Any, Union
 
-from _socket import SO_BROADCAST, AF_INET, SOCK_DGRAM, SOL_SOCKET, IPPROTO_UDP, inet_aton, inet_ntoa
-from homeassistant.core import HomeAssistant
-from netifaces import AF_INET
+from socket import socket, AF_INET, SOCK_DGRAM, IPPROTO_UDP, SOL_SOCKET, SO_BROADCAST, inet_aton, inet_ntoa
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, Event
+from homeassistant.helpers.storage import Store
 
 from custom_components.artnet_led.client import OpCode, ArtBase, ArtPoll, ArtPollReply, PortAddress, IndicatorState, \
     PortAddressProgrammingAuthority, BootProcess, NodeReport, Port, PortType, StyleCode, FailsafeState, \
-    DiagnosticsMode, DiagnosticsPriority, ArtIpProgReply, ArtDiagData, ArtTimeCode, ArtCommand, ArtTrigger, ArtDmx
-from custom_components.artnet_led.client.net_utils import get_private_ip, get_default_gateway
+    DiagnosticsMode, DiagnosticsPriority, ArtIpProgReply, ArtDiagData, ArtTimeCode, ArtCommand, ArtTrigger, ArtDmx, \
+    ArtSync, ART_NET_HEADER
+from custom_components.artnet_led.client.net_utils import get_private_ip, get_default_gateway, get_broadcast_address, \
+    get_interface_ip, bind_to_interface
+from custom_components.artnet_led.client.port_ranges import PortRanges
+from custom_components.artnet_led.client.timers import Timers
 
 STALE_NODE_CUTOFF_TIME = 10
 
+# Seconds between two ArtPolls for the same range of port addresses
+POLL_INTERVAL = (2.5, 3)
+
+# Ranges of our port addresses less than this many port addresses apart share an ArtPoll, and there are never more
+# than this many ArtPolls per round. Nodes in between the ranges reply needlessly, but that's cheaper than the polls.
+POLL_SHARD_MIN_GAP = 16
+MAX_POLL_SHARDS = 8
+
+# A node that replied this many times with the same port addresses is stable. Ranges whose port addresses are only
+# listened to by stable nodes are polled this many times less often, and their nodes take as much longer to expire.
+STABLE_NODE_REPLIES = 3
+STABLE_POLL_FACTOR = 3
+
+# Discovered nodes are remembered across restarts, so output doesn't have to wait for them to reply again
+STORAGE_KEY = "artnet_led.nodes"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# A port stops reporting that it receives data after this many seconds without ArtDmx
+INPUT_TIMEOUT = 4
+
+# Art-Net nodes may consider a stream lost when they haven't been refreshed for 4 seconds
+MAX_KEEPALIVE_MS = 4000
+
+# ArtDmx is limited by the DMX512 frame rate, which can't exceed 44 fps
+DEFAULT_MAX_FPS = 44
+
+# Node changes within this window are announced to subscribers with a single set of ArtPollReply
+DEFAULT_NOTIFY_INTERVAL_MS = 100
+
+# Above this many nodes listening to the same port address, the spec recommends broadcasting its ArtDmx
+DEFAULT_BROADCAST_THRESHOLD = 40
+
 ARTNET_PORT = 0x1936
+BROADCAST_ADDRESS = "255.255.255.255"
 
 RDM_SUPPORT = False  # TODO
 SWITCH_TO_SACN_SUPPORT = False  # TODO
@@ -35,10 +75,17 @@ class Node:
     addr: bytes = [0x00] * 4,
     bind_index: int = 0,
 
-    last_seen: datetime.datetime = datetime.datetime.now(),
+    last_seen: float = 0,
     net_switch: int = 0,
     sub_switch: int = 0
     ports: list[Port] = None
+    stable_replies: int = 0
+
+    # Of its last ArtPollReply, save for the node report, which changes with every reply
+    fingerprint: int | None = None
+
+    def is_stable(self) -> bool:
+        return self.stable_replies >= STABLE_NODE_REPLIES
 
     def get_addresses(self) -> set[PortAddress]:
         if not self.ports:
@@ -66,11 +113,89 @@ class Node:
         return hash((self.addr, self.bind_index))
 
 
+@dataclass
+class RefreshPolicy:
+    """When to retransmit an unchanged universe: a quick burst right after every change, to cover for lost UDP
+    packets, after which it backs off to a slow keepalive."""
+    burst_count: int = 3
+    burst_interval_ms: int = 100
+    keepalive_ms: int = 900
+
+    def __post_init__(self):
+        if self.keepalive_ms > MAX_KEEPALIVE_MS:
+            log.debug(f"Keepalive of {self.keepalive_ms}ms is too slow for Art-Net, using {MAX_KEEPALIVE_MS}ms")
+            self.keepalive_ms = MAX_KEEPALIVE_MS
+
+
 @dataclass
 class OwnPort:
     port: Port = field(default_factory=Port)
     data: bytearray | None = None
-    update_task: Task[None] = None
+    next_due: float | None = None
+
+    # New data that goes out with the next pass of the ArtDmx loop
+    changed: bool = False
+
+    refresh_policy: RefreshPolicy = field(default_factory=RefreshPolicy)
+    burst_remaining: int = 0
+    is_keeping_alive: bool = False
+    retransmits_saved: int = 0
+
+    packets_per_frame: int = 0
+
+    packet: bytearray | None = None
+    payload: memoryview | None = None
+
+    # The latest frame sent while no node listened to this port yet
+    pending: bytearray | None = None
+
+    last_received: bytes | None = None
+    last_input_seen: float = 0
+    frames_received: int = 0
+    frames_suppressed: int = 0
+
+    # The newest received frame that hasn't been handed to the state callback yet, as that's rate limited
+    inbound: bytes | None = None
+    last_delivered: float = 0
+    frames_dropped: int = 0
+
+    def update_packet(self, address: PortAddress, data: bytearray):
+        """Copies data into the pre-serialized ArtDmx packet, only serializing a new one if the length changed."""
+        if self.payload is None or len(self.payload) != len(data):
+            self.packet = ArtDmx(physical=HA_PHYSICAL_PORT, port_address=address, data=data).serialize()
+            self.payload = memoryview(self.packet)[ArtDmx.DATA_OFFSET:]
+        else:
+            self.payload[:] = data
+
+        self.burst_remaining = self.refresh_policy.burst_count
+        self.is_keeping_alive = False
+
+    def schedule_refresh(self, now: float) -> float | None:
+        """Called right after the packet has been sent, returns when it should be retransmitted."""
+        policy = self.refresh_policy
+
+        if self.is_keeping_alive and policy.burst_interval_ms:
+            # The packet just sent was a keepalive. Compared to retransmitting at the burst rate for as long as the
+            # universe stays unchanged, that saved this many packets.
+            self.retransmits_saved += policy.keepalive_ms // policy.burst_interval_ms - 1
+
+        if self.burst_remaining:
+            self.burst_remaining -= 1
+            return now + policy.burst_interval_ms / 1000.0
+
+        if not policy.keepalive_ms:
+            return None
+
+        self.is_keeping_alive = True
+        return now + policy.keepalive_ms / 1000.0
+
+
+@dataclass
+class PollShard:
+    """A group of our port addresses, which gets its own ArtPoll targeting the range from the first to the last."""
+    port_addresses: list[PortAddress]
+    packet: bytearray
+    next_poll: float = 0
 
 
 class ArtNetServer(asyncio.DatagramProtocol):
@@ -79,7 +204,11 @@ class ArtNetServer(asyncio.DatagramProtocol):
                  oem: int = 0, esta=0,
                  short_name: str = "PyArtNet", long_name: str = "Python ArtNet Server",
                  is_server_dhcp_configured: bool = True, polling: bool = True, sequencing: bool = True,
-                 retransmit_time_ms: int = 900):
+                 retransmit_time_ms: int = 900, retransmit_burst_count: int = 3,
+                 retransmit_burst_interval_ms: int = 100, sync: bool = False,
+                 broadcast_threshold: int = DEFAULT_BROADCAST_THRESHOLD, max_fps: int = DEFAULT_MAX_FPS,
+                 notify_interval_ms: int = DEFAULT_NOTIFY_INTERVAL_MS, max_input_fps: int = DEFAULT_MAX_FPS,
+                 interface: str | None = None):
         super().__init__()
 
         self.__hass = hass
@@ -95,16 +224,35 @@ class ArtNetServer(asyncio.DatagramProtocol):
         self._sequencing = sequencing
         self.sequence_number = 1 if sequencing else 0
         self.retransmit_time_ms = retransmit_time_ms
+        self.retransmit_burst_count = retransmit_burst_count
+        self.retransmit_burst_interval_ms = retransmit_burst_interval_ms
+        self._sync = sync
+        self.broadcast_threshold = broadcast_threshold
+        self.max_fps = max_fps
+        self.max_input_fps = max_input_fps
+        self.notify_interval_ms = notify_interval_ms
+        self._last_notified: float | None = None
+        self._sync_packet = ArtSync().serialize()
 
         self.own_port_addresses = {}
+        self._own_port_ranges = PortRanges()
         self.node_change_subscribers = set()
 
         self.nodes_by_ip = {}
         self.nodes_by_port_address = {}
-
-        self._own_ip = inet_aton(get_private_ip())
+        self._destinations_by_port_address: dict[PortAddress, tuple[tuple[str, int], ...]] = {}
+
+        # Without an interface, we listen on all of them and talk through whichever one the default route uses
+        self.interface = interface
+        own_ip = get_interface_ip(interface) if interface else get_private_ip()
+        self._own_ip = inet_aton(own_ip)
+        self._own_ip_str = own_ip
+        self._broadcast_address = get_broadcast_address(own_ip)
         self._default_gateway = inet_aton(get_default_gateway())
 
+        # With an interface, our broadcasts stay within its subnet, rather than going out of every NIC
+        self._broadcast_target = self._broadcast_address if interface else BROADCAST_ADDRESS
+
         self.indicator_state = IndicatorState.LOCATE_IDENTIFY
         self.node_report = NodeReport.RC_POWER_OK
         self.status_message = "Starting ArtNet server..."
@@ -114,27 +262,95 @@ class ArtNetServer(asyncio.DatagramProtocol):
 
         self.startup_time = None
 
+        # Serialized once, until the ports they describe change
+        self._poll_shards: list[PollShard] | None = None
+        self.poll_replies_processed = 0
+        self.poll_reply_processing_time = 0.0
+        self._poll_replies: list[tuple[int, str, bytearray]] | None = None
+
+        self._socket: socket | None = None
+        self._transport: transports.DatagramTransport | None = None
+        self._poll_task: Task[None] | None = None
+        self._artdmx_task: Task[None] | None = None
+        self._artdmx_wakeup: asyncio.Future[None] | None = None
+        self._poll_wakeup: asyncio.Future[None] | None = None
+
+        # Node expiry, input activity and ArtDmx refresh deadlines, all on the loop's monotonic clock
+        self._timers = Timers(hass.loop)
+
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{interface}" if interface else STORAGE_KEY)
+
         self.mac = uuid.getnode().to_bytes(6, "big")
 
+        self._datagram_handlers = {
+            OpCode.OP_POLL.value: self._handle_poll_datagram,
+            OpCode.OP_POLL_REPLY.value: self._handle_poll_reply_datagram,
+            OpCode.OP_IP_PROG.value: self._handle_ip_prog_datagram,
+            OpCode.OP_IP_PROG_REPLY.value: self._handle_ip_prog_reply_datagram,
+            OpCode.OP_ADDRESS.value: self._handle_address_datagram,
+            OpCode.OP_DIAG_DATA.value: self._handle_diag_data_datagram,
+            OpCode.OP_TIME_CODE.value: self._handle_time_code_datagram,
+            OpCode.OP_COMMAND.value: self._handle_command_datagram,
+            OpCode.OP_TRIGGER.value: self._handle_trigger_datagram,
+            OpCode.OP_OUTPUT_DMX.value: self._handle_dmx_datagram,
+            OpCode.OP_SYNC.value: self._handle_sync_datagram,
+        }
+
     def uptime(self) -> int:
         return (datetime.datetime.now() - self.startup_time).seconds if self.startup_time else 0
 
-    def add_port(self, port_address: PortAddress):
+    def add_port(self, port_address: PortAddress, refresh_policy: RefreshPolicy | None = None):
         port = Port(input=True, output=True, type=PortType.ART_NET,
                     sw_in=port_address.universe, sw_out=port_address.universe)
 
-        self.own_port_addresses[port_address] = OwnPort(port)
+        self.own_port_addresses[port_address] = OwnPort(port, refresh_policy=refresh_policy or
+                                                        self.default_refresh_policy())
+        self._own_port_ranges.add(port_address)
+        self._poll_shards = None
         self.update_subscribers()
 
+        # Poll for the new port right away, rather than when the poll loop would next wake up by itself
+        self._wake_poll_loop()
+
+    def default_refresh_policy(self, retransmit_time_ms: int | None = None) -> RefreshPolicy:
+        """The configured retransmits, with a keepalive of retransmit_time_ms rather than the server's if given."""
+        if retransmit_time_ms is None:
+            retransmit_time_ms = self.retransmit_time_ms
+        if not retransmit_time_ms:
+            return RefreshPolicy(burst_count=0, keepalive_ms=0)
+        return RefreshPolicy(burst_count=self.retransmit_burst_count,
+                             burst_interval_ms=self.retransmit_burst_interval_ms,
+                             keepalive_ms=retransmit_time_ms)
+
+    def set_refresh_policy(self, port_address: PortAddress, refresh_policy: RefreshPolicy):
+        self.own_port_addresses[port_address].refresh_policy = refresh_policy
+
+    @property
+    def retransmits_saved(self) -> int:
+        return sum(own_port.retransmits_saved for own_port in self.own_port_addresses.values())
+
+    @property
+    def frames_suppressed(self) -> int:
+        return sum(own_port.frames_suppressed for own_port in self.own_port_addresses.values())
+
+    @property
+    def frames_dropped(self) -> int:
+        return sum(own_port.frames_dropped for own_port in self.own_port_addresses.values())
+
+    @property
+    def packets_per_frame(self) -> dict[PortAddress, int]:
+        return {address: own_port.packets_per_frame for address, own_port in self.own_port_addresses.items()}
+
     def remove_port(self, port_address: PortAddress):
         del self.own_port_addresses[port_address]
+        self._own_port_ranges.remove(port_address)
+        self._timers.cancel(("input", port_address))
+        self._timers.cancel(("inbound", port_address))
+        self._poll_shards = None
         self.update_subscribers()
 
     def get_port_bounds(self) -> Union[tuple[PortAddress, PortAddress], None]:
-        port_addresses = self.own_port_addresses.keys()
-        if not port_addresses:
-            return None
-        return min(port_addresses), max(port_addresses)
+        return self._own_port_ranges.bounds()
 
     def get_node_by_ip(self, addr: bytes, bind_index: int = 1) -> Node | None:
         return self.nodes_by_ip.get((addr, bind_index), None)
@@ -150,6 +366,7 @@ class ArtNetServer(asyncio.DatagramProtocol):
         if nodes:
             if node not in nodes:
                 nodes.add(node)
+                self.update_destinations(port_address)
 
                 if self.uptime() > 3:
                     own_port: OwnPort = self.own_port_addresses.get(port_address, None)
@@ -159,9 +376,21 @@ class ArtNetServer(asyncio.DatagramProtocol):
 
         else:
             self.nodes_by_port_address[port_address] = {node}
+            self.update_destinations(port_address)
+
+            # Either nothing was sent to this port address yet, or its nodes all expired and output stopped. In both
+            # cases, pick up where we left off.
+            own_port: OwnPort = self.own_port_addresses.get(port_address, None)
+            data = own_port and (own_port.pending if own_port.pending is not None else own_port.data)
+            if data is not None:
+                log.info(f"Found the first node listening to port address {port_address}, sending it the data "
+                         f"we've been holding on to.")
+                own_port.pending = None
+                self.send_dmx(port_address, data)
 
     def remove_node_by_ip(self, addr: bytes, bind_index: int = 1):
         del self.nodes_by_ip[addr, bind_index]
+        self._timers.cancel(("node", addr, bind_index))
 
     def remove_node_by_port_address(self, port_address: PortAddress, node: Node):
         nodes = self.nodes_by_port_address[port_address]
@@ -171,13 +400,48 @@ class ArtNetServer(asyncio.DatagramProtocol):
             nodes.remove(node)
         if not nodes:
             del self.nodes_by_port_address[port_address]
+        self.update_destinations(port_address)
 
         if node not in self.nodes_by_ip.values():
             ip_str = inet_ntoa(node.addr)
             if ip_str in self.node_change_subscribers:
                 self.node_change_subscribers.remove(ip_str)
 
+    def update_destinations(self, port_address: PortAddress):
+        """Rebuilds where ArtDmx for the port address goes, so sending doesn't need to look anything up."""
+        nodes = self.nodes_by_port_address.get(port_address)
+        old_destinations = self._destinations_by_port_address.pop(port_address, None)
+        if not nodes:
+            return
+
+        broadcast_destinations = ((self._broadcast_address, ARTNET_PORT),)
+        ips = {node.addr for node in nodes}
+        if len(ips) > self.broadcast_threshold:
+            destinations = broadcast_destinations
+        else:
+            destinations = tuple((inet_ntoa(ip), ARTNET_PORT) for ip in sorted(ips))
+
+        if old_destinations and (old_destinations == broadcast_destinations) != \
+                (destinations == broadcast_destinations):
+            log.info(f"{len(ips)} nodes listen to port address {port_address}, switching its ArtDmx to "
+                     f"{'broadcast' if destinations == broadcast_destinations else 'unicast'}")
+
+        self._destinations_by_port_address[port_address] = destinations
+
     def update_subscribers(self):
+        # Every change to our ports' state ends up here
+        self._poll_replies = None
+        if not self.node_change_subscribers or "subscribers" in self._timers:
+            return
+
+        now = self._timers.time()
+        notify_at = now
+        if self._last_notified is not None:
+            notify_at = max(now, self._last_notified + self.notify_interval_ms / 1000.0)
+        self._timers.schedule("subscribers", notify_at, self.notify_subscribers)
+
+    def notify_subscribers(self):
+        self._last_notified = self._timers.time()
         for subscriber in self.node_change_subscribers:
             self.send_reply(subscriber)
 
@@ -206,77 +470,213 @@ class ArtNetServer(asyncio.DatagramProtocol):
         return grouped_list
 
     def start_server(self):
-        loop = self.__hass.loop
-        server_event = loop.create_datagram_endpoint(lambda: self, local_addr=('0.0.0.0', ARTNET_PORT))
-
         if self._polling:
-            self.__hass.async_create_background_task(self.start_poll_loop(), "Art-Net polling loop")
-        log.info("ArtNet server started")
+            self._poll_task = self.__hass.async_create_background_task(self.start_poll_loop(),
+                                                                       "Art-Net polling loop")
+        self._artdmx_task = self.__hass.async_create_background_task(self.start_artdmx_loop(), "Art-Net ArtDmx loop")
+        self.__hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_handle_stop)
+        log.info(f"ArtNet server started on {self.interface or 'all interfaces'}")
 
-        return self.__hass.async_add_job(server_event)
+        return self.__hass.async_add_job(self._create_endpoint())
 
-    async def start_poll_loop(self):
-        while True:
+    async def _create_endpoint(self):
+        await self.load_nodes()
+
+        # We keep hold of the socket ourselves, so batches of packets can be written to it directly
+        sock = socket(AF_INET, SOCK_DGRAM, IPPROTO_UDP)
+        sock.setsockopt(SOL_SOCKET, SO_BROADCAST, 1)
+        sock.setblocking(False)
+
+        bind_address = '0.0.0.0'
+        if self.interface and not bind_to_interface(sock, self.interface):
+            # Still keeps our traffic on the interface, but broadcasts from other controllers won't reach us
+            bind_address = inet_ntoa(self._own_ip)
+            log.warning(f"Couldn't bind the ArtNet server to interface {self.interface}, binding to its address "
+                        f"{bind_address} instead. This won't receive broadcast ArtPolls from other controllers.")
+
+        sock.bind((bind_address, ARTNET_PORT))
+        self._socket = sock
+
+        return await self.__hass.loop.create_datagram_endpoint(lambda: self, sock=sock)
+
+    def stop_server(self):
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+        if self._artdmx_task:
+            self._artdmx_task.cancel()
+            self._artdmx_task = None
+
+        self._timers.clear()
+
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        log.info("ArtNet server stopped")
+
+    async def _async_handle_stop(self, event: Event):
+        self.stop_server()
+
+    def get_poll_shards(self) -> list[PollShard]:
+        if self._poll_shards is not None:
+            return self._poll_shards
+
+        # One ArtPoll per group of nearby port addresses of ours, so nodes far outside of them aren't bothered to reply
+        poll_shards = []
+        for port_addresses in self._own_port_ranges.groups(POLL_SHARD_MIN_GAP, MAX_POLL_SHARDS):
             poll = ArtPoll()
-            port_bounds = self.get_port_bounds()
-            if port_bounds:
-                poll.target_port_bounds = port_bounds
-                poll.notify_on_change = True
-                poll.enable_diagnostics(DiagnosticsMode.UNICAST, DiagnosticsPriority.DP_HIGH)
+            poll.target_port_bounds = (port_addresses[0], port_addresses[-1])
+            poll.notify_on_change = True
+            poll.enable_diagnostics(DiagnosticsMode.UNICAST, DiagnosticsPriority.DP_HIGH)
+            poll_shards.append(PollShard(port_addresses, poll.serialize()))
 
-                log.debug("Sending ArtPoll")
-                with socket(AF_INET, SOCK_DGRAM, IPPROTO_UDP) as sock:
-                    sock.setsockopt(SOL_SOCKET, SO_BROADCAST, 1)
-                    sock.setblocking(False)
-                    sock.sendto(poll.serialize(), ("255.255.255.255", 0x1936))
+        self._poll_shards = poll_shards
+        return poll_shards
 
-                self.__hass.async_create_background_task(self.remove_stale_nodes(), "Art-Net remove stale nodes")
+    def is_shard_stable(self, poll_shard: PollShard) -> bool:
+        for port_address in poll_shard.port_addresses:
+            nodes = self.nodes_by_port_address.get(port_address)
+            if not nodes or not all(node.is_stable() for node in nodes):
+                return False
+        return True
 
-                log.debug("Sleeping a few seconds before polling again...")
-            await asyncio.sleep(random.uniform(2.5, 3))
+    def _wake_poll_loop(self):
+        if self._poll_wakeup and not self._poll_wakeup.done():
+            self._poll_wakeup.set_result(None)
 
-    async def remove_stale_nodes(self):
-        await asyncio.sleep(STALE_NODE_CUTOFF_TIME)
+    async def start_poll_loop(self):
+        while True:
+            now = self._timers.time()
+            next_poll = now + POLL_INTERVAL[1]
+
+            for poll_shard in self.get_poll_shards():
+                if poll_shard.next_poll <= now:
+                    log.debug(f"Sending ArtPoll for {poll_shard.port_addresses[0]}..{poll_shard.port_addresses[-1]}")
+                    self._send_packet(poll_shard.packet, self._broadcast_target)
+
+                    poll_interval = random.uniform(*POLL_INTERVAL)
+                    if self.is_shard_stable(poll_shard):
+                        poll_interval *= STABLE_POLL_FACTOR
+                    poll_shard.next_poll = now + poll_interval
+
+                next_poll = min(next_poll, poll_shard.next_poll)
+
+            log.debug("Sleeping a few seconds before polling again...")
+            self._poll_wakeup = asyncio.get_running_loop().create_future()
+            self._timers.schedule("poll", next_poll, self._wake_poll_loop)
+            await self._poll_wakeup
+
+    def remove_stale_node(self, node: Node):
+        # Replies only bump last_seen, so the deadline is moved here rather than on every reply
+        now = self._timers.time()
+        stale_at = node.last_seen + STALE_NODE_CUTOFF_TIME * (STABLE_POLL_FACTOR if node.is_stable() else 1)
+        if stale_at > now:
+            self._timers.schedule(("node", node.addr, node.bind_index), stale_at, self.remove_stale_node, node)
+            return
 
-        now = datetime.datetime.now()
-        cutoff_time: datetime.datetime = now - datetime.timedelta(seconds=STALE_NODE_CUTOFF_TIME)
+        log.warning(f"Haven't seen node {inet_ntoa(node.addr)}#{node.bind_index} for {int(now - node.last_seen)} "
+                    f"seconds; removing it.")
+        for node_address in node.get_addresses():
+            self.remove_node_by_port_address(node_address, node)
 
-        nodes_by_ip_to_delete = []
+        self.nodes_by_ip.pop((node.addr, node.bind_index), None)
+        self.save_nodes()
+
+    async def load_nodes(self):
+        """Restores the nodes from the previous run. Until they reply to our polls, they expire like any other."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
 
-        for (ip, bind_index), node in self.nodes_by_ip.items():
-            if node.last_seen > cutoff_time:
+        now = self._timers.time()
+        for stored_node in stored.get("nodes", []):
+            addr = inet_aton(stored_node["addr"])
+            bind_index = stored_node["bind_index"]
+            if self.get_node_by_ip(addr, bind_index):
                 continue
 
-            time_delta: datetime.timedelta = now - node.last_seen
+            ports = [Port(input=p["input"], output=p["output"], sw_in=p["sw_in"], sw_out=p["sw_out"])
+                     for p in stored_node["ports"]]
+            node = Node(addr, bind_index, now, stored_node["net_switch"], stored_node["sub_switch"], ports)
+            self.add_node_by_ip(node, addr, bind_index)
+            self._timers.schedule(("node", addr, bind_index), now + STALE_NODE_CUTOFF_TIME,
+                                  self.remove_stale_node, node)
+            for address in node.get_addresses():
+                self.add_node_by_port_address(address, node)
+
+        log.info(f"Restored {len(self.nodes_by_ip)} nodes from the previous run")
+
+    def save_nodes(self):
+        self._store.async_delay_save(self._nodes_to_store, STORAGE_SAVE_DELAY)
+
+    def _nodes_to_store(self) -> dict:
+        return {
+            "nodes": [
+                {
+                    "addr": inet_ntoa(node.addr),
+                    "bind_index": node.bind_index,
+                    "net_switch": node.net_switch,
+                    "sub_switch": node.sub_switch,
+                    "ports": [{"input": p.input, "output": p.output, "sw_in": p.sw_in, "sw_out": p.sw_out}
+                              for p in node.ports or []]
+                }
+                for node in self.nodes_by_ip.values()
+            ]
+        }
 
-            log.warning(f"Haven't seen node {inet_ntoa(ip)}#{bind_index} for {time_delta.seconds} seconds;"
-                        f" removing it.")
-            nodes_by_ip_to_delete += [(ip, bind_index)]
-            for node_address in node.get_addresses():
-                self.remove_node_by_port_address(node_address, node)
+    def send_artnet(self, art_packet: ArtBase, ip: str):
+        self._send_packet(art_packet.serialize(), ip)
 
-        for (ip, bind_index) in nodes_by_ip_to_delete:
-            del self.nodes_by_ip[(ip, bind_index)]
+    def _send_packet(self, packet: bytes | bytearray, ip: str):
+        # All output goes through the one socket bound in start_server, rather than a new socket per packet.
+        if not self._transport:
+            log.debug(f"Not sending packet to {ip}, as the ArtNet server isn't listening (anymore).")
+            return
+        self._transport.sendto(packet, (ip, ARTNET_PORT))
 
-    @staticmethod
-    def send_artnet(art_packet: ArtBase, ip: str):
-        with socket(AF_INET, SOCK_DGRAM, IPPROTO_UDP) as sock:
-            sock.setblocking(False)
-            sock.sendto(art_packet.serialize(), (ip, ARTNET_PORT))
+    def _send_batch(self, batch: list[tuple[bytes | bytearray, tuple[str, int]]]):
+        """Sends a whole frame worth of packets in one go, straight to the socket where possible."""
+        transport = self._transport
+        if not transport or not batch:
+            return
+
+        # Only skip the transport while it has nothing queued, otherwise we'd send packets out of order
+        if transport.get_write_buffer_size() == 0:
+            sendto = self._socket.sendto
+            for index, (packet, addr) in enumerate(batch):
+                try:
+                    sendto(packet, addr)
+                except (BlockingIOError, InterruptedError):
+                    batch = batch[index:]
+                    break
+                except OSError as exc:
+                    self.error_received(exc)
+            else:
+                return
+
+        # Let the transport queue whatever the socket couldn't take right now
+        for packet, addr in batch:
+            transport.sendto(packet, addr)
 
     def send_diagnostics(self, addr: str = None, diagnostics_priority=DiagnosticsPriority.DP_MED,
                          diagnostics_mode=DiagnosticsMode.BROADCAST):
         diag_data = ArtDiagData(diag_priority=diagnostics_priority, logical_port=0, text=self.status_message)
-        address = addr if diagnostics_mode == DiagnosticsMode.UNICAST else bytes("255.255.255.255")
+        address = addr if diagnostics_mode == DiagnosticsMode.UNICAST else self._broadcast_target
         self.send_artnet(diag_data, address)
 
-    def send_reply(self, addr):
+    def get_poll_replies(self) -> list[tuple[int, str, bytearray]]:
+        if self._poll_replies is not None:
+            return self._poll_replies
+
+        poll_replies = []
         bind_index = None
         for (net, sub_net, ports_chunk) in self.get_grouped_ports():
             if bind_index is None:
                 bind_index = 0 if len(ports_chunk) == 1 else 1
 
             for ports in ports_chunk:
+                # The node report is patched in right before sending
                 node_report = self.node_report.report(self.art_poll_reply_counter, self.status_message)
 
                 poll_reply = ArtPollReply(
@@ -293,17 +693,32 @@ class ArtNetServer(asyncio.DatagramProtocol):
                     supports_rdm_through_artnet=RDM_SUPPORT, failsafe_state=FailsafeState.HOLD_LAST_STATE
                 )
 
-                log.debug(f"Sending ArtPollReply from bind_index {bind_index} for {net}/{sub_net}/"
-                          f"[{','.join([str(p.sw_out) for p in ports])}]"
-                          )
-                self.send_artnet(poll_reply, addr)
+                ports_description = f"{net}/{sub_net}/[{','.join([str(p.sw_out) for p in ports])}]"
+                poll_replies.append((bind_index, ports_description, poll_reply.serialize()))
 
-                self.art_poll_reply_counter += 1
                 if bind_index != 0:
                     bind_index += 1
 
-    def send_dmx(self, address: PortAddress, data: bytearray) -> Task[None] | None:
+        self._poll_replies = poll_replies
+        return poll_replies
+
+    def send_reply(self, addr):
+        for bind_index, ports_description, packet in self.get_poll_replies():
+            ArtPollReply.patch_node_report(packet,
+                                           self.node_report.report(self.art_poll_reply_counter, self.status_message))
+
+            log.debug(f"Sending ArtPollReply from bind_index {bind_index} for {ports_description}")
+            self._send_packet(packet, addr)
+
+            self.art_poll_reply_counter += 1
+
+    def send_dmx(self, address: PortAddress, data: bytearray) -> None:
         if not self.get_node_by_port_address(address):
+            # Only the latest frame matters, it goes out as soon as a node for this port address shows up
+            own_port = self.own_port_addresses.get(address)
+            if own_port:
+                own_port.pending = bytearray(data)
+
             if self.uptime() < 3:
                 log.debug("Can't currently send DMX as nodes haven't had the chance to be discovered.")
                 return
@@ -318,156 +733,235 @@ class ArtNetServer(asyncio.DatagramProtocol):
             return
 
         own_port = self.own_port_addresses[address]
-        if own_port.update_task:
-            own_port.update_task.cancel()
+        own_port.data = data
+        own_port.update_packet(address, data)
 
         is_already_outputting = own_port.port.good_output_a.data_being_transmitted
         if not is_already_outputting:
             own_port.port.good_output_a.data_being_transmitted = True
             self.update_subscribers()
 
-        task = self.__hass.async_create_task(self.start_artdmx_loop(address, data, own_port))
-        own_port.update_task = task
-        return task
+        # The ArtDmx loop picks it up on its next pass, together with any other port that was updated meanwhile.
+        # Calls within one frame of the last pass only replace the data that will go out with the next one.
+        own_port.changed = True
+        self._wake_artdmx_loop()
 
-    async def start_artdmx_loop(self, address, data, own_port):
-        own_port.data = data
-        art_dmx = ArtDmx(sequence_number=self.sequence_number, physical=HA_PHYSICAL_PORT, port_address=address,
-                         data=data)
-        packet = art_dmx.serialize()
+    def _wake_artdmx_loop(self):
+        if self._artdmx_wakeup and not self._artdmx_wakeup.done():
+            self._artdmx_wakeup.set_result(None)
+
+    async def start_artdmx_loop(self):
+        loop = asyncio.get_running_loop()
+
+        # One frame clock for all ports, so universes changed together always go out in the same pass
+        frame_interval = 1.0 / self.max_fps
+        last_pass = None
 
         while True:
-            nodes = self.get_node_by_port_address(address)
-            if not nodes:
-                log.warning(f"No nodes found that listen to port address {address}. "
-                            f"Stopping sending ArtDmx refreshes...")
-                own_port.port.good_output_a.data_being_transmitted = False
-                self.update_subscribers()
+            now = loop.time()
+            next_due = None
+            for own_port in self.own_port_addresses.values():
+                due = now if own_port.changed else own_port.next_due
+                if due is not None and (next_due is None or due < next_due):
+                    next_due = due
+
+            if next_due is not None and last_pass is not None:
+                next_due = max(next_due, last_pass + frame_interval)
+
+            if next_due is not None and next_due <= now:
+                last_pass = now
+                self._send_artdmx_pass(now)
+                continue
+
+            # Sleep until either the next pass is due, or send_dmx wakes us up
+            self._artdmx_wakeup = loop.create_future()
+            if next_due is not None:
+                self._timers.schedule("artdmx", next_due, self._wake_artdmx_loop)
             else:
-                with socket(AF_INET, SOCK_DGRAM, IPPROTO_UDP) as sock:
-                    sock.setblocking(False)
-                    for node in nodes:
-                        ip_str = inet_ntoa(node.addr)
-                        log.debug(f"Sending ArtDmx to {ip_str}")
-                        sock.sendto(packet, (ip_str, ARTNET_PORT))
-
-            if self._sequencing:
-                self.sequence_number += 0x01
-                if self.sequence_number > 0xFF:
-                    self.sequence_number = 0x01
-                art_dmx.sequence_number = self.sequence_number
-                packet = art_dmx.serialize()
-
-            if self.retransmit_time_ms == 0:
-                return
+                self._timers.cancel("artdmx")
+            await self._artdmx_wakeup
+
+    def _send_artdmx_pass(self, now: float):
+        """Sends every port with new data, along with every port whose retransmit is due."""
+        batch = []
+        for address, own_port in self.own_port_addresses.items():
+            if not own_port.changed and (own_port.next_due is None or own_port.next_due > now):
+                continue
 
-            await asyncio.sleep(self.retransmit_time_ms / 1000.0)
+            own_port.changed = False
+            self.send_artdmx(address, own_port, batch)
+            if own_port.port.good_output_a.data_being_transmitted:
+                own_port.next_due = own_port.schedule_refresh(now)
+            else:
+                own_port.next_due = None
+
+        # All universes sent in this pass are latched by the nodes at once
+        if self._sync and batch:
+            log.debug("Sending ArtSync")
+            batch.append((self._sync_packet, (self._broadcast_target, ARTNET_PORT)))
+
+        self._send_batch(batch)
+
+    def send_artdmx(self, address: PortAddress, own_port: OwnPort,
+                    batch: list[tuple[bytes | bytearray, tuple[str, int]]]):
+        destinations = self._destinations_by_port_address.get(address)
+        if not destinations:
+            log.warning(f"No nodes found that listen to port address {address}. "
+                        f"Stopping sending ArtDmx refreshes...")
+            own_port.port.good_output_a.data_being_transmitted = False
+            self.update_subscribers()
+            return
+
+        packet = own_port.packet
+        packet[ArtDmx.SEQUENCE_OFFSET] = self.sequence_number
+        for destination in destinations:
+            batch.append((packet, destination))
+        own_port.packets_per_frame = len(destinations)
+
+        if self._sequencing:
+            self.sequence_number += 0x01
+            if self.sequence_number > 0xFF:
+                self.sequence_number = 0x01
 
     def connection_made(self, transport: transports.DatagramTransport) -> None:
         self.startup_time = datetime.datetime.now()
+        self._transport = transport
         log.debug("Server connection made")
         super().connection_made(transport)
 
     def connection_lost(self, exc: Exception | None) -> None:
+        self._transport = None
+        self._socket = None
         super().connection_lost(exc)
 
+    def error_received(self, exc: Exception) -> None:
+        log.warning(f"Error on the ArtNet socket: {exc}")
+
     def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
         self.handle_datagram(addr, data)
 
-    def handle_datagram(self, addr, data):
-        data = bytearray(data)
-        opcode = ArtBase.peek_opcode(data)
-        if opcode == OpCode.OP_POLL:
-            poll = ArtPoll()
-            poll.deserialize(data)
-
-            log.debug(f"Received ArtPoll from {addr[0]}")
-            self.handle_poll(addr, poll)
-
-        elif opcode == OpCode.OP_POLL_REPLY:
-            reply = ArtPollReply()
-            reply.deserialize(data)
-
-            log.debug(f"Received ArtPollReply from {reply.long_name}")
-            self.handle_poll_reply(addr, reply)
-
-        elif opcode == OpCode.OP_IP_PROG:
-            log.debug(f"Received IP prog request from {addr[0]}, ignoring...")
-
-        elif opcode == OpCode.OP_IP_PROG_REPLY:
-            ip_prog_reply = ArtIpProgReply()
-            ip_prog_reply.deserialize(data)
-
-            log.debug(f"Received IP prog reply from {addr[0]}:\n"
-                      f"  IP      : {ip_prog_reply.prog_ip}\n"
-                      f"  Subnet  : {ip_prog_reply.prog_subnet}\n"
-                      f"  Gateway : {ip_prog_reply.prog_gateway}\n"
-                      f"  DHCP    : {ip_prog_reply.dhcp_enabled}")
-            #                 TODO set port.good_input.data_received
+    def handle_datagram(self, addr, data: bytes):
+        if len(data) < 10 or not data.startswith(ART_NET_HEADER):
+            log.debug(f"Received a packet from {addr[0]} that isn't Art-Net, ignoring...")
+            return
 
-        elif opcode == OpCode.OP_ADDRESS:
-            log.debug(f"Received Adress request from {addr[0]}, not doing anything with it...")
+        opcode = data[8] | data[9] << 8
+        handler = self._datagram_handlers.get(opcode)
+        if not handler:
+            log.warning(f"Received Opcode {hex(opcode)}, which isn't supported yet!")
+            return
 
-        elif opcode == OpCode.OP_DIAG_DATA:
-            diag_data = ArtDiagData()
-            diag_data.deserialize(data)
+        handler(addr, data)
 
-            log.debug(f"Received Diag Data from {addr[0]}:\n"
-                      f"  Priority     : {diag_data.diag_priority}\n"
-                      f"  Logical port : {diag_data.logical_port}\n"
-                      f"  Text         : {diag_data.text}")
+    def _handle_poll_datagram(self, addr, data: bytes):
+        poll = ArtPoll()
+        poll.deserialize(data)
 
-        elif opcode == OpCode.OP_TIME_CODE:
-            timecode = ArtTimeCode()
-            timecode.deserialize(data)
+        log.debug(f"Received ArtPoll from {addr[0]}")
+        self.handle_poll(addr, poll)
 
-            log.debug(f"Received Time Code from {addr[0]}:\n"
-                      f"  Current time/frame : {timecode.hours}:{timecode.minutes}:{timecode.seconds}.{timecode.frames}\n"
-                      f"  Type               : {timecode.type}")
+    def _handle_poll_reply_datagram(self, addr, data: bytes):
+        start = time.perf_counter()
 
-        elif opcode == OpCode.OP_COMMAND:
-            command = ArtCommand()
-            command.deserialize(data)
+        # Known nodes mostly repeat themselves, so the reply is only parsed when it differs from the last one
+        source_ip = data[ArtPollReply.SOURCE_IP_OFFSET:ArtPollReply.SOURCE_IP_OFFSET + 4]
+        bind_index = data[ArtPollReply.BIND_INDEX_OFFSET] if len(data) > ArtPollReply.BIND_INDEX_OFFSET else 0
+        view = memoryview(data)
+        fingerprint = zlib.crc32(view[ArtPollReply.NODE_REPORT_OFFSET + ArtPollReply.NODE_REPORT_LENGTH:],
+                                 zlib.crc32(view[:ArtPollReply.NODE_REPORT_OFFSET]))
 
-            log.debug(f"Received command from {addr[0]}\n"
-                      f"  ESTA    : {command.esta}\n"
-                      f"  Command : {command.command}")
-            self.handle_command(command)
+        node = self.get_node_by_ip(source_ip, bind_index)
+        if node and node.fingerprint == fingerprint:
+            node.last_seen = self._timers.time()
+            node.stable_replies += 1
+        else:
+            reply = ArtPollReply()
+            reply.deserialize(data)
 
-        elif opcode == OpCode.OP_TRIGGER:
-            trigger = ArtTrigger()
-            trigger.deserialize(data)
+            log.debug(f"Received ArtPollReply from {reply.long_name}")
+            self.handle_poll_reply(addr, reply)
 
-            log.debug(f"Received trigger from {addr[0]}\n"
-                      f"  OEM    : {trigger.oem}\n"
-                      f"  Key    : {trigger.key}\n"
-                      f"  Subkey : {trigger.sub_key}")
-            self.handle_trigger(trigger)
+            node = self.get_node_by_ip(source_ip, bind_index)
+            if node:
+                node.fingerprint = fingerprint
+
+        self.poll_replies_processed += 1
+        self.poll_reply_processing_time += time.perf_counter() - start
+
+    def _handle_ip_prog_datagram(self, addr, data: bytes):
+        log.debug(f"Received IP prog request from {addr[0]}, ignoring...")
+
+    def _handle_ip_prog_reply_datagram(self, addr, data: bytes):
+        ip_prog_reply = ArtIpProgReply()
+        ip_prog_reply.deserialize(data)
+
+        log.debug(f"Received IP prog reply from {addr[0]}:\n"
+                  f"  IP      : {ip_prog_reply.prog_ip}\n"
+                  f"  Subnet  : {ip_prog_reply.prog_subnet}\n"
+                  f"  Gateway : {ip_prog_reply.prog_gateway}\n"
+                  f"  DHCP    : {ip_prog_reply.dhcp_enabled}")
+        #                 TODO set port.good_input.data_received
+
+    def _handle_address_datagram(self, addr, data: bytes):
+        log.debug(f"Received Adress request from {addr[0]}, not doing anything with it...")
+
+    def _handle_diag_data_datagram(self, addr, data: bytes):
+        diag_data = ArtDiagData()
+        diag_data.deserialize(data)
+
+        log.debug(f"Received Diag Data from {addr[0]}:\n"
+                  f"  Priority     : {diag_data.diag_priority}\n"
+                  f"  Logical port : {diag_data.logical_port}\n"
+                  f"  Text         : {diag_data.text}")
+
+    def _handle_time_code_datagram(self, addr, data: bytes):
+        timecode = ArtTimeCode()
+        timecode.deserialize(data)
+
+        log.debug(f"Received Time Code from {addr[0]}:\n"
+                  f"  Current time/frame : {timecode.hours}:{timecode.minutes}:{timecode.seconds}.{timecode.frames}\n"
+                  f"  Type               : {timecode.type}")
+
+    def _handle_command_datagram(self, addr, data: bytes):
+        command = ArtCommand()
+        command.deserialize(data)
+
+        log.debug(f"Received command from {addr[0]}\n"
+                  f"  ESTA    : {command.esta}\n"
+                  f"  Command : {command.command}")
+        self.handle_command(command)
+
+    def _handle_trigger_datagram(self, addr, data: bytes):
+        trigger = ArtTrigger()
+        trigger.deserialize(data)
+
+        log.debug(f"Received trigger from {addr[0]}\n"
+                  f"  OEM    : {trigger.oem}\n"
+                  f"  Key    : {trigger.key}\n"
+                  f"  Subkey : {trigger.sub_key}")
+        self.handle_trigger(trigger)
+
+    def _handle_dmx_datagram(self, addr, data: bytes):
+        # This is the hottest path by far, so rather than deserializing a whole ArtDmx, only the header is unpacked
+        # and the callback gets a view on the DMX data inside the datagram itself.
+        if len(data) < ArtDmx.DATA_OFFSET:
+            log.debug(f"Received truncated ArtDmx from {addr[0]}, ignoring...")
+            return
 
-        elif opcode == OpCode.OP_OUTPUT_DMX:
-            dmx = ArtDmx()
-            dmx.deserialize(data)
+        # Our own ArtDmx comes back to us once it's broadcast, that's not input from a console
+        if addr[0] == self._own_ip_str:
+            return
 
-            log.debug(f"Received DMX data from {addr[0]}\n"
-                      f"  Address: {dmx.port_address}")
-            self.handle_dmx(dmx)
+        port_address, length = ArtDmx.unpack_header(data)
+        self.handle_dmx(PortAddress.parse(port_address),
+                        memoryview(data)[ArtDmx.DATA_OFFSET:ArtDmx.DATA_OFFSET + length])
 
-        elif opcode == OpCode.OP_SYNC:
-            # No action
-            pass
-
-        else:
-            log.warning(f"Received Opcode {opcode}, which isn't supported yet!")
+    def _handle_sync_datagram(self, addr, data: bytes):
+        # We apply received ArtDmx immediately, so there's nothing to latch
+        log.debug(f"Received ArtSync from {addr[0]}")
 
     def should_handle_ports(self, lower_port: PortAddress, upper_port: PortAddress) -> bool:
-        if not self.own_port_addresses:
-            return False
-
-        port_bounds = self.get_port_bounds()
-        if not port_bounds:
-            return False
-
-        return not (lower_port > port_bounds[1] or upper_port < port_bounds[0])
+        return self._own_port_ranges.overlaps(lower_port, upper_port)
 
     def handle_poll_reply(self, addr, reply):
         if reply.source_ip is not bytes([0x00] * 4):
@@ -491,10 +985,13 @@ class ArtNetServer(asyncio.DatagramProtocol):
         bind_index = reply.bind_index
         node = self.get_node_by_ip(source_ip, bind_index)
 
-        current_time = datetime.datetime.now()
-        if not node:
+        current_time = self._timers.time()
+        is_new_node = not node
+        if is_new_node:
             node = Node(source_ip, bind_index, current_time)
             self.add_node_by_ip(node, source_ip, bind_index)
+            self._timers.schedule(("node", source_ip, bind_index), current_time + STALE_NODE_CUTOFF_TIME,
+                                  self.remove_stale_node, node)
             log.info(f"Discovered new node at {inet_ntoa(source_ip)}@{bind_index} with "
                      f"{reply.net_switch}:{reply.sub_switch}:[{','.join([str(p.sw_out) for p in reply.ports if p.output])}]"
                      )
@@ -520,6 +1017,12 @@ class ArtNetServer(asyncio.DatagramProtocol):
         for address_to_remove in addresses_to_remove:
             self.remove_node_by_port_address(address_to_remove, node)
 
+        if is_new_node or new_addresses != old_addresses:
+            node.stable_replies = 0
+            self.save_nodes()
+        else:
+            node.stable_replies += 1
+
         for new_address in new_addresses:
             self.add_node_by_port_address(new_address, node)
 
@@ -571,29 +1074,58 @@ class ArtNetServer(asyncio.DatagramProtocol):
         #  3: Scenes!
         pass
 
-    def handle_dmx(self, dmx: ArtDmx):
-        own_port = self.own_port_addresses.get(dmx.port_address)
+    def handle_dmx(self, port_address: PortAddress, data: memoryview):
+        own_port = self.own_port_addresses.get(port_address)
         if not own_port:
-            log.debug(f"Received ArtDmx for port address that we don't care about: {dmx.port_address}")
+            log.debug(f"Received ArtDmx for port address that we don't care about: {port_address}")
             return
 
-        if own_port.port.good_input.data_received:
+        own_port.last_input_seen = now = self._timers.time()
+        if not own_port.port.good_input.data_received:
             own_port.port.good_input.data_received = True
             self.update_subscribers()
+            self._timers.schedule(("input", port_address), now + INPUT_TIMEOUT, self.disable_input_flag,
+                                  port_address, own_port)
 
-        own_port.port.last_input_seen = datetime.datetime.now()
-        self.__hass.async_create_task(self.disable_input_flag(own_port))
-        if self.__state_update_callback:
-            self.__state_update_callback(dmx.port_address, dmx.data)
+        # Consoles keep resending unchanged frames, those don't need to be decoded again
+        own_port.frames_received += 1
+        if own_port.last_received == data:
+            own_port.frames_suppressed += 1
+            return
+        own_port.last_received = bytes(data)
 
-    async def disable_input_flag(self, own_port: OwnPort):
-        await asyncio.sleep(4)
+        # Only the newest frame per port is kept, and handed over at most max_input_fps times per second
+        if own_port.inbound is not None:
+            own_port.frames_dropped += 1
+        own_port.inbound = own_port.last_received
 
-        cutoff_time = datetime.datetime.now() - datetime.timedelta(seconds=4)
+        if ("inbound", port_address) in self._timers:
+            return
 
-        if own_port.port.last_input_seen < cutoff_time:
-            own_port.port.good_input.data_received = False
-            self.update_subscribers()
+        deliver_at = own_port.last_delivered + 1.0 / self.max_input_fps
+        if deliver_at <= now:
+            self.deliver_dmx(port_address, own_port)
+        else:
+            self._timers.schedule(("inbound", port_address), deliver_at, self.deliver_dmx, port_address, own_port)
+
+    def deliver_dmx(self, port_address: PortAddress, own_port: OwnPort):
+        data, own_port.inbound = own_port.inbound, None
+        if data is None:
+            return
+
+        own_port.last_delivered = self._timers.time()
+        if self.__state_update_callback:
+            self.__state_update_callback(port_address, data)
+
+    def disable_input_flag(self, port_address: PortAddress, own_port: OwnPort):
+        # Frames only bump last_input_seen, so the deadline is moved here rather than on every frame
+        idle_at = own_port.last_input_seen + INPUT_TIMEOUT
+        if idle_at > self._timers.time():
+            self._timers.schedule(("input", port_address), idle_at, self.disable_input_flag, port_address, own_port)
+            return
+
+        own_port.port.good_input.data_received = False
+        self.update_subscribers()
 
 # server = ArtNetServer(firmware_version=1, short_name="Test python", long_name="Hello I am testing ArtNet server",
 #                       polling=True)
@@ -1,6 +1,6 @@
 import socket
 
-from netifaces import gateways, AF_INET
+from netifaces import gateways, interfaces, ifaddresses, AF_INET
 
 
 def get_default_gateway():
@@ -18,3 +18,30 @@ def get_private_ip():
         return '127.0.0.1'
     finally:
         s.close()
+
+
+def get_interface_ip(interface: str) -> str:
+    for address in ifaddresses(interface).get(AF_INET, []):
+        if address.get('addr'):
+            return address['addr']
+    raise ValueError(f"Interface {interface} doesn't have an IPv4 address")
+
+
+def bind_to_interface(sock: socket.socket, interface: str) -> bool:
+    """Restricts the socket to the interface. Only Linux supports this, and it needs CAP_NET_RAW."""
+    if not hasattr(socket, 'SO_BINDTODEVICE'):
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BINDTODEVICE, interface.encode())
+        return True
+    except OSError:
+        return False
+
+
+def get_broadcast_address(ip: str) -> str:
+    """The directed broadcast address of the subnet that the interface with the given IP is part of."""
+    for interface in interfaces():
+        for address in ifaddresses(interface).get(AF_INET, []):
+            if address.get('addr') == ip and address.get('broadcast'):
+                return address['broadcast']
+    return '255.255.255.255'
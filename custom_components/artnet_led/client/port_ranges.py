@@ -0,0 +1,101 @@
+from bisect import bisect_right
+from typing import Iterator
+
+from custom_components.artnet_led.client import PortAddress
+
+
+class PortRanges:
+    """A set of port addresses, kept as sorted, disjoint runs of contiguous port addresses.
+
+    Overlap queries are a binary search over the runs, so they stay exact however sparse the port addresses are.
+    """
+
+    def __init__(self):
+        # Run i covers the packed port addresses _starts[i] up to and including _ends[i]
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    def __contains__(self, port_address: PortAddress) -> bool:
+        return self._find(port_address.port_address) >= 0
+
+    def add(self, port_address: PortAddress):
+        value = port_address.port_address
+        i = bisect_right(self._starts, value) - 1
+        if i >= 0 and value <= self._ends[i]:
+            return
+
+        starts, ends = self._starts, self._ends
+        joins_previous = i >= 0 and ends[i] + 1 == value
+        joins_next = i + 1 < len(starts) and starts[i + 1] - 1 == value
+
+        if joins_previous and joins_next:
+            ends[i] = ends[i + 1]
+            del starts[i + 1], ends[i + 1]
+        elif joins_previous:
+            ends[i] = value
+        elif joins_next:
+            starts[i + 1] = value
+        else:
+            starts.insert(i + 1, value)
+            ends.insert(i + 1, value)
+
+    def remove(self, port_address: PortAddress):
+        value = port_address.port_address
+        i = self._find(value)
+        if i < 0:
+            raise KeyError(port_address)
+
+        starts, ends = self._starts, self._ends
+        start, end = starts[i], ends[i]
+        if start == end:
+            del starts[i], ends[i]
+        elif value == start:
+            starts[i] = value + 1
+        elif value == end:
+            ends[i] = value - 1
+        else:
+            ends[i] = value - 1
+            starts.insert(i + 1, value + 1)
+            ends.insert(i + 1, end)
+
+    def overlaps(self, lower: PortAddress, upper: PortAddress) -> bool:
+        """Whether any of the port addresses lies within lower..upper, both inclusive."""
+        i = bisect_right(self._starts, upper.port_address) - 1
+        return i >= 0 and self._ends[i] >= lower.port_address
+
+    def bounds(self) -> tuple[PortAddress, PortAddress] | None:
+        if not self._starts:
+            return None
+        return PortAddress.parse(self._starts[0]), PortAddress.parse(self._ends[-1])
+
+    def ranges(self) -> Iterator[list[PortAddress]]:
+        """The runs of contiguous port addresses, in ascending order."""
+        for start, end in zip(self._starts, self._ends):
+            yield [PortAddress.parse(value) for value in range(start, end + 1)]
+
+    def groups(self, min_gap: int, max_groups: int) -> Iterator[list[PortAddress]]:
+        """The port addresses, in ascending order and split up where they are at least min_gap port addresses apart.
+
+        If that still leaves more than max_groups groups, only the widest gaps split them.
+        """
+        starts, ends = self._starts, self._ends
+        gaps = [(starts[i + 1] - ends[i] - 1, i) for i in range(len(starts) - 1)]
+        splits = [gap for gap in gaps if gap[0] >= min_gap]
+        if len(splits) >= max_groups:
+            splits = sorted(splits, reverse=True)[:max_groups - 1]
+
+        first = 0
+        for _, last in sorted(splits, key=lambda gap: gap[1]) + [(0, len(starts) - 1)]:
+            if last < first:
+                break
+            yield [PortAddress.parse(value)
+                   for start, end in zip(starts[first:last + 1], ends[first:last + 1])
+                   for value in range(start, end + 1)]
+            first = last + 1
+
+    def _find(self, value: int) -> int:
+        i = bisect_right(self._starts, value) - 1
+        return i if i >= 0 and value <= self._ends[i] else -1
@@ -0,0 +1,108 @@
+import heapq
+import logging
+from asyncio import AbstractEventLoop, TimerHandle
+from typing import Any, Callable, Hashable
+
+log = logging.getLogger(__name__)
+
+
+class Timers:
+    """Keyed deadlines on the event loop's monotonic clock, all driven by a single `loop.call_at` handle.
+
+    Scheduling a key that already has a deadline replaces it. Cancelled entries stay in the heap until they surface,
+    unless they start to outnumber the live ones.
+    """
+
+    def __init__(self, loop: AbstractEventLoop):
+        self._loop = loop
+        self._heap: list[list] = []
+        self._entries: dict[Hashable, list] = {}
+        self._counter = 0
+        self._handle: TimerHandle | None = None
+        self._handle_when: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def time(self) -> float:
+        return self._loop.time()
+
+    def deadline(self, key: Hashable) -> float | None:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def schedule(self, key: Hashable, when: float, callback: Callable[..., Any], *args):
+        old_entry = self._entries.get(key)
+        if old_entry:
+            if old_entry[0] == when:
+                old_entry[3] = callback
+                old_entry[4] = args
+                return
+            old_entry[2] = None
+
+        self._counter += 1
+        entry = [when, self._counter, key, callback, args]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._compact()
+        self._arm()
+
+    def cancel(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry:
+            entry[2] = None
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+            self._handle_when = None
+
+    def _compact(self):
+        # In place, as _run may be popping from this very list when a callback schedules
+        self._heap[:] = [entry for entry in self._heap if entry[2] is not None]
+        heapq.heapify(self._heap)
+
+    def _arm(self):
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+
+        if not heap:
+            return
+
+        when = heap[0][0]
+        if self._handle_when is not None and self._handle_when <= when:
+            return
+
+        if self._handle:
+            self._handle.cancel()
+        self._handle = self._loop.call_at(when, self._run)
+        self._handle_when = when
+
+    def _run(self):
+        self._handle = None
+        self._handle_when = None
+
+        now = self._loop.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            when, _, key, callback, args = entry
+            if key is None or self._entries.get(key) is not entry:
+                continue
+            del self._entries[key]
+
+            try:
+                callback(*args)
+            except Exception:
+                log.exception(f"Timer {key} failed")
+
+        self._arm()
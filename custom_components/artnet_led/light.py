@@ -33,6 +33,7 @@ from pyartnet import BaseUniverse, Channel
 from pyartnet.errors import UniverseNotFoundError
 
 from custom_components.artnet_led.bridge.artnet_controller import ArtNetController
+from custom_components.artnet_led.bridge.artnet_direct_node import ArtNetDirectNode
 from custom_components.artnet_led.bridge.channel_bridge import ChannelBridge
 from custom_components.artnet_led.util.channel_switch import validate, to_values, from_values
 
@@ -52,6 +53,8 @@ CONF_NODE_PORT_OVERRIDE = "port_override"
 CONF_NODE_TYPE = "node_type"
 CONF_NODE_MAX_FPS = "max_fps"
 CONF_NODE_REFRESH = "refresh_every"
+CONF_NODE_SYNC = "sync"
+CONF_NODE_INTERFACE = "interface"
 CONF_NODE_UNIVERSES = "universes"
 
 CONF_DEVICE_CHANNEL = "channel"
@@ -89,6 +92,8 @@ async def async_setup_platform(hass: HomeAssistant, config, async_add_devices, d
     client_type = config.get(CONF_NODE_TYPE)
     max_fps = config.get(CONF_NODE_MAX_FPS)
     refresh_interval = config.get(CONF_NODE_REFRESH)
+    sync = config.get(CONF_NODE_SYNC)
+    interface = config.get(CONF_NODE_INTERFACE)
 
     host = config.get(CONF_NODE_HOST)
     port = config.get(CONF_NODE_PORT)
@@ -108,24 +113,29 @@ async def async_setup_platform(hass: HomeAssistant, config, async_add_devices, d
 
         __id = f"{host}:{port}"
         if __id not in NODES:
-            __node = pyartnet.ArtNetNode(
+            __node = ArtNetDirectNode(
                 real_host,
                 real_port,
                 max_fps=max_fps,
                 refresh_every=refresh_interval,
                 start_refresh_task=(refresh_interval > 0),
-                sequence_counter=True
+                sequence_counter=True,
+                sync=sync
             )
             NODES[__id] = __node
 
         node = NODES[__id]
 
     elif client_type == "artnet-controller":
-        if "server" not in NODES:
-            __node = ArtNetController(hass, max_fps=max_fps, refresh_every=refresh_interval)
-            NODES["server"] = __node
-            __node.start()
-        node = NODES["server"]
+        # One server per interface, each only handling the universes configured for it
+        __id = f"server:{interface}" if interface else "server"
+        if __id not in NODES:
+            __node = ArtNetController(hass, max_fps=max_fps, refresh_every=refresh_interval, sync=sync,
+                                      interface=interface)
+            NODES[__id] = __node
+            # Also restores the nodes discovered during the previous run, before any light restores its state
+            await __node.start()
+        node = NODES[__id]
 
     elif client_type == "sacn":
         if real_port is None:
@@ -176,6 +186,8 @@ async def async_setup_platform(hass: HomeAssistant, config, async_add_devices, d
             universe.output_correction = AVAILABLE_CORRECTIONS.get(
                 universe_cfg[CONF_OUTPUT_CORRECTION]
             )
+            if isinstance(node, ArtNetController) and universe_cfg.get(CONF_NODE_REFRESH) is not None:
+                node.set_refresh_every(universe_nr, universe_cfg[CONF_NODE_REFRESH])
 
         for device in universe_cfg[CONF_DEVICES]:  # type: dict
             device = device.copy()
@@ -1383,12 +1395,30 @@ class DmxRGBWW(DmxBaseLight):
 __CLASS_LIST = [DmxDimmer, DmxRGB, DmxWhite, DmxRGBW, DmxRGBWW, DmxBinary, DmxFixed, DmxDimmerGroup, DmxRGBGroup]
 __CLASS_TYPE = {k.CONF_TYPE: k for k in __CLASS_LIST}
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
+
+def _sync_requires_art_net(config):
+    if config[CONF_NODE_SYNC] and config[CONF_NODE_TYPE] in ("sacn", "kinet"):
+        raise vol.Invalid(f"'{CONF_NODE_SYNC}' is not supported for node type '{config[CONF_NODE_TYPE]}'",
+                          path=[CONF_NODE_SYNC])
+    return config
+
+
+def _interface_requires_controller(config):
+    if CONF_NODE_INTERFACE in config and config[CONF_NODE_TYPE] != "artnet-controller":
+        raise vol.Invalid(f"'{CONF_NODE_INTERFACE}' is not supported for node type '{config[CONF_NODE_TYPE]}'",
+                          path=[CONF_NODE_INTERFACE])
+    return config
+
+
+PLATFORM_SCHEMA = vol.All(PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_NODE_HOST): cv.string,
         vol.Required(CONF_NODE_UNIVERSES): {
             vol.All(int, vol.Range(min=0, max=1024)): {
                 vol.Optional(CONF_SEND_PARTIAL_UNIVERSE, default=True): cv.boolean,
+                vol.Optional(CONF_NODE_REFRESH): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=9999)
+                ),
                 vol.Optional(CONF_OUTPUT_CORRECTION, default='linear'): vol.Any(
                     None, vol.In(AVAILABLE_CORRECTIONS)
                 ),
@@ -1442,10 +1472,12 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Optional(CONF_NODE_REFRESH, default=120): vol.All(
             vol.Coerce(float), vol.Range(min=0, max=9999)
         ),
+        vol.Optional(CONF_NODE_SYNC, default=False): cv.boolean,
+        vol.Optional(CONF_NODE_INTERFACE): cv.string,
         vol.Optional(CONF_NODE_TYPE, default="artnet-direct"): vol.Any(
             None, vol.In(["artnet-direct", "artnet-controller", "sacn", "kinet"])
         ),
     },
     required=True,
     extra=vol.PREVENT_EXTRA,
-)
+), _sync_requires_art_net, _interface_requires_controller)
@@ -0,0 +1,57 @@
+import asyncio
+
+from custom_components.artnet_led.bridge.artnet_direct_node import ArtNetDirectNode
+from custom_components.artnet_led.client import ArtBase, OpCode
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent: list[bytes] = []
+
+    def sendto(self, packet, addr):
+        self.sent.append(bytes(packet))
+        return len(packet)
+
+    def opcodes(self) -> list[OpCode]:
+        return [ArtBase.peek_opcode(packet) for packet in self.sent]
+
+
+def direct_node(sync: bool) -> tuple[ArtNetDirectNode, FakeSocket]:
+    node = ArtNetDirectNode("10.0.0.7", 6454, start_refresh_task=False, sync=sync)
+    node._socket.close()
+    socket = FakeSocket()
+    node._socket = socket
+    for universe in range(3):
+        node.add_universe(universe).add_channel(1, 1)
+    return node, socket
+
+
+def test_one_artsync_follows_batch_of_universes():
+    async def scenario():
+        node, socket = direct_node(sync=True)
+
+        for universe in node._universes:
+            universe.send_data()
+        assert socket.opcodes() == [OpCode.OP_OUTPUT_DMX] * 3
+
+        await asyncio.sleep(0)
+        assert socket.opcodes() == [OpCode.OP_OUTPUT_DMX] * 3 + [OpCode.OP_SYNC]
+
+        node[1].send_data()
+        await asyncio.sleep(0)
+        assert socket.opcodes()[4:] == [OpCode.OP_OUTPUT_DMX, OpCode.OP_SYNC]
+
+    asyncio.run(scenario())
+
+
+def test_no_artsync_without_sync():
+    async def scenario():
+        node, socket = direct_node(sync=False)
+
+        for universe in node._universes:
+            universe.send_data()
+        await asyncio.sleep(0)
+
+        assert socket.opcodes() == [OpCode.OP_OUTPUT_DMX] * 3
+
+    asyncio.run(scenario())
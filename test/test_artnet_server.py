@@ -0,0 +1,330 @@
+import asyncio
+from socket import inet_aton
+
+import pytest
+
+from custom_components.artnet_led.client import ArtBase, ArtDmx, ArtPoll, ArtPollReply, OpCode, Port, PortAddress
+from custom_components.artnet_led.client import artnet_server
+from custom_components.artnet_led.client.artnet_server import ArtNetServer, ARTNET_PORT, MAX_KEEPALIVE_MS, OwnPort, \
+    RefreshPolicy
+
+NODE_IP = "10.0.0.7"
+OWN_IP = "10.0.0.2"
+
+
+class FakeHass:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+
+
+class FakeStore:
+    def __init__(self, hass, version, key):
+        self.data = None
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay):
+        self.data = data_func()
+
+
+class FakeTransport:
+    """Stands in for both the datagram transport and the raw socket, recording everything sent through either."""
+
+    def __init__(self):
+        self.sent: list[tuple[bytes, tuple[str, int]]] = []
+
+    def sendto(self, packet, addr):
+        self.sent.append((bytes(packet), addr))
+
+    def get_write_buffer_size(self):
+        return 0
+
+    def close(self):
+        pass
+
+    def dmx(self) -> list[tuple[PortAddress, bytes]]:
+        frames = []
+        for packet, addr in self.sent:
+            if ArtBase.peek_opcode(packet) == OpCode.OP_OUTPUT_DMX:
+                dmx = ArtDmx()
+                dmx.deserialize(packet)
+                frames.append((dmx.port_address, bytes(dmx.data)))
+        return frames
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(artnet_server, "Store", FakeStore)
+    monkeypatch.setattr(artnet_server, "get_private_ip", lambda: OWN_IP)
+    monkeypatch.setattr(artnet_server, "get_broadcast_address", lambda ip: "10.0.0.255")
+    monkeypatch.setattr(artnet_server, "get_default_gateway", lambda: "10.0.0.1")
+
+
+def start(*universes: int, **kwargs) -> tuple[ArtNetServer, FakeTransport]:
+    """A server with the universes as its ports, whose ArtDmx loop runs on the current event loop."""
+    server = ArtNetServer(FakeHass(), polling=False, **kwargs)
+    for universe in universes:
+        server.add_port(PortAddress(0, 0, universe))
+
+    transport = FakeTransport()
+    server.connection_made(transport)
+    server._socket = transport
+    server._artdmx_task = asyncio.get_running_loop().create_task(server.start_artdmx_loop())
+    return server, transport
+
+
+def discover(server: ArtNetServer, *universes: int, ip: str = NODE_IP):
+    reply = ArtPollReply(source_ip=inet_aton(ip), ports=[Port(output=True, sw_out=u) for u in universes])
+    server.handle_datagram((ip, ARTNET_PORT), bytes(reply.serialize()))
+
+
+def receive(server: ArtNetServer, universe: int, data: bytes, ip: str = NODE_IP):
+    dmx = ArtDmx(port_address=PortAddress(0, 0, universe), data=bytearray(data))
+    server.handle_datagram((ip, ARTNET_PORT), bytes(dmx.serialize()))
+
+
+def test_one_artdmx_task_for_all_ports():
+    async def scenario():
+        universes = range(16)
+        server, transport = start(*universes)
+        discover(server, 0, 1, 2, 3)
+        for universe in universes:
+            discover(server, universe, ip=f"10.0.1.{universe}")
+        tasks = len(asyncio.all_tasks())
+
+        for universe in universes:
+            server.send_dmx(PortAddress(0, 0, universe), bytearray([universe]))
+        await asyncio.sleep(0.01)
+
+        assert len(asyncio.all_tasks()) == tasks
+        assert sorted(transport.dmx()) == sorted(
+            [(PortAddress(0, 0, u), bytes([u])) for u in range(4)] +
+            [(PortAddress(0, 0, u), bytes([u])) for u in universes]
+        )
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_latest_frame_wins():
+    async def scenario():
+        server, transport = start(1)
+        discover(server, 1)
+
+        for value in range(5):
+            server.send_dmx(PortAddress(0, 0, 1), bytearray([value, value]))
+        await asyncio.sleep(0.01)
+
+        assert transport.dmx() == [(PortAddress(0, 0, 1), bytes([4, 4]))]
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_pending_frame_is_flushed_to_first_node():
+    async def scenario():
+        server, transport = start(1)
+
+        server.send_dmx(PortAddress(0, 0, 1), bytearray([1, 2]))
+        server.send_dmx(PortAddress(0, 0, 1), bytearray([3, 4]))
+        await asyncio.sleep(0.01)
+        assert transport.dmx() == []
+
+        discover(server, 1)
+        await asyncio.sleep(0.01)
+        assert transport.dmx() == [(PortAddress(0, 0, 1), bytes([3, 4]))]
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_output_resumes_when_expired_node_returns():
+    async def scenario():
+        server, transport = start(1, retransmit_burst_count=0, retransmit_time_ms=50)
+        discover(server, 1)
+        server.send_dmx(PortAddress(0, 0, 1), bytearray([1, 2]))
+        await asyncio.sleep(0.01)
+
+        node = server.get_node_by_ip(inet_aton(NODE_IP), 1)
+        node.last_seen -= 100
+        server.remove_stale_node(node)
+        assert server.get_node_by_port_address(PortAddress(0, 0, 1)) is None
+
+        # The next keepalive finds nobody to send to, and stops the output
+        await asyncio.sleep(0.1)
+        own_port = server.own_port_addresses[PortAddress(0, 0, 1)]
+        assert not own_port.port.good_output_a.data_being_transmitted
+
+        transport.sent.clear()
+        discover(server, 1)
+        await asyncio.sleep(0.01)
+        assert transport.dmx() == [(PortAddress(0, 0, 1), bytes([1, 2]))]
+        assert own_port.port.good_output_a.data_being_transmitted
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_inbound_counters():
+    async def scenario():
+        delivered = []
+        server, transport = start(1, state_update_callback=lambda address, data: delivered.append(bytes(data)))
+
+        for _ in range(3):
+            receive(server, 1, bytes([7]))
+        assert server.frames_suppressed == 2
+
+        for value in range(1, 5):
+            receive(server, 1, bytes([value]))
+        # Right after delivering a frame, only the newest of the next ones is kept
+        assert server.frames_dropped == 3
+
+        await asyncio.sleep(0.1)
+        assert delivered == [bytes([7]), bytes([4])]
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_first_artpoll_goes_out_when_ports_are_added():
+    async def scenario():
+        server, transport = start()
+        poll_task = asyncio.get_running_loop().create_task(server.start_poll_loop())
+        await asyncio.sleep(0.01)
+
+        server.add_port(PortAddress(0, 0, 1))
+        await asyncio.sleep(0.01)
+
+        assert [ArtBase.peek_opcode(packet) for packet, addr in transport.sent] == [OpCode.OP_POLL]
+        poll_task.cancel()
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_own_broadcast_artdmx_is_not_input():
+    async def scenario():
+        delivered = []
+        server, transport = start(1, state_update_callback=lambda address, data: delivered.append(bytes(data)))
+        own_port = server.own_port_addresses[PortAddress(0, 0, 1)]
+
+        receive(server, 1, bytes([9]), ip=OWN_IP)
+        await asyncio.sleep(0.01)
+        assert delivered == []
+        assert not own_port.port.good_input.data_received
+
+        receive(server, 1, bytes([7]))
+        await asyncio.sleep(0.01)
+        assert delivered == [bytes([7])]
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_universes_changed_together_share_one_artsync():
+    async def scenario():
+        server, transport = start(1, 2, sync=True, max_fps=25, retransmit_burst_count=0, retransmit_time_ms=4000)
+        discover(server, 1, 2)
+
+        server.send_dmx(PortAddress(0, 0, 1), bytearray([0]))
+        await asyncio.sleep(0.02)
+
+        # A fade over both universes, starting in the middle of universe 1's frame
+        for value in range(1, 6):
+            server.send_dmx(PortAddress(0, 0, 1), bytearray([value]))
+            server.send_dmx(PortAddress(0, 0, 2), bytearray([value]))
+            await asyncio.sleep(0.04)
+
+        passes = [[]]
+        for packet, addr in transport.sent:
+            opcode = ArtBase.peek_opcode(packet)
+            if opcode == OpCode.OP_SYNC:
+                passes.append([])
+            elif opcode == OpCode.OP_OUTPUT_DMX:
+                dmx = ArtDmx()
+                dmx.deserialize(packet)
+                passes[-1].append((dmx.port_address.universe, dmx.data[0]))
+
+        assert passes[0] == [(1, 0)]
+        assert passes[-1] == []
+        for frame in passes[1:-1]:
+            assert len(frame) == 2
+            assert {universe for universe, _ in frame} == {1, 2}
+            assert frame[0][1] == frame[1][1]
+        assert passes[-2] == [(1, 5), (2, 5)]
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_refresh_bursts_then_keeps_alive():
+    own_port = OwnPort(refresh_policy=RefreshPolicy(burst_count=2, burst_interval_ms=100, keepalive_ms=900))
+    own_port.update_packet(PortAddress(0, 0, 1), bytearray(2))
+
+    sent_at = [0.0]
+    for _ in range(5):
+        sent_at.append(round(own_port.schedule_refresh(sent_at[-1]), 3))
+
+    assert sent_at == [0.0, 0.1, 0.2, 1.1, 2.0, 2.9]
+
+    # Only the keepalives sent at 1.1 and 2.0 count, each saving 8 of the 9 burst rate retransmits
+    assert own_port.retransmits_saved == 16
+
+
+def test_refresh_restarts_burst_on_change():
+    own_port = OwnPort(refresh_policy=RefreshPolicy(burst_count=1, burst_interval_ms=100, keepalive_ms=900))
+    own_port.update_packet(PortAddress(0, 0, 1), bytearray(2))
+    assert own_port.schedule_refresh(0.0) == pytest.approx(0.1)
+    assert own_port.schedule_refresh(0.1) == pytest.approx(1.0)
+
+    own_port.update_packet(PortAddress(0, 0, 1), bytearray([1, 1]))
+    assert own_port.schedule_refresh(0.5) == pytest.approx(0.6)
+    assert own_port.retransmits_saved == 0
+
+
+def test_keepalive_is_capped():
+    assert RefreshPolicy(keepalive_ms=10000).keepalive_ms == MAX_KEEPALIVE_MS
+
+
+def test_no_retransmits_without_retransmit_time():
+    async def scenario():
+        server, transport = start(1, retransmit_time_ms=0)
+        discover(server, 1)
+
+        server.send_dmx(PortAddress(0, 0, 1), bytearray([1, 2]))
+        await asyncio.sleep(0.3)
+
+        assert transport.dmx() == [(PortAddress(0, 0, 1), bytes([1, 2]))]
+        assert server.retransmits_saved == 0
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_nearby_port_addresses_share_an_artpoll():
+    async def scenario():
+        server, transport = start(1, 2, 5, 100)
+
+        shards = server.get_poll_shards()
+        assert [[port_address.universe for port_address in shard.port_addresses] for shard in shards] == \
+               [[1, 2, 5], [100]]
+
+        poll = ArtPoll()
+        poll.deserialize(shards[0].packet)
+        assert poll.target_port_bounds == (PortAddress(0, 0, 1), PortAddress(0, 0, 5))
+        server.stop_server()
+
+    asyncio.run(scenario())
+
+
+def test_refresh_policy_for_other_keepalive_keeps_the_burst():
+    async def scenario():
+        server, transport = start(1, retransmit_burst_count=3, retransmit_time_ms=0)
+
+        assert server.default_refresh_policy() == RefreshPolicy(burst_count=0, keepalive_ms=0)
+        assert server.default_refresh_policy(2000) == RefreshPolicy(burst_count=3, keepalive_ms=2000)
+        assert server.default_refresh_policy(0) == RefreshPolicy(burst_count=0, keepalive_ms=0)
+        server.stop_server()
+
+    asyncio.run(scenario())
@@ -0,0 +1,204 @@
+import pytest
+
+from custom_components.artnet_led.client import ART_NET_HEADER, ArtAddress, ArtAddressCommand, ArtCommand, \
+    ArtDiagData, ArtDmx, ArtIpProg, ArtIpProgCommand, ArtIpProgReply, ArtPoll, ArtPollReply, ArtSync, ArtTimeCode, \
+    ArtTrigger, DiagnosticsPriority, Port, PortAddress, TimeCodeType, ValueAction
+
+
+def test_art_dmx_serialize():
+    dmx = ArtDmx(sequence_number=7, physical=1, port_address=PortAddress(1, 2, 3), data=bytearray([1, 2, 3, 4]))
+
+    assert dmx.serialize() == ART_NET_HEADER + bytes.fromhex("0050" "000e" "07" "01" "0324" "0004" "01020304")
+
+
+def test_art_dmx_deserialize():
+    dmx = ArtDmx()
+    index = dmx.deserialize(ART_NET_HEADER + bytes.fromhex("0050" "000e" "07" "01" "0324" "0004" "01020304"))
+
+    assert index == 22
+    assert dmx.sequence_number == 7
+    assert dmx.physical == 1
+    assert dmx.port_address == PortAddress(1, 2, 3)
+    assert bytes(dmx.data) == bytes([1, 2, 3, 4])
+
+
+def test_art_dmx_deserialize_does_not_share_port_address():
+    first = ArtDmx()
+    first.deserialize(ArtDmx(port_address=PortAddress(0, 0, 1)).serialize())
+    second = ArtDmx()
+    second.deserialize(ArtDmx(port_address=PortAddress(0, 0, 2)).serialize())
+
+    assert first.port_address == PortAddress(0, 0, 1)
+    assert second.port_address == PortAddress(0, 0, 2)
+
+
+def test_art_dmx_deserialize_too_short():
+    assert ArtDmx().deserialize(ART_NET_HEADER + bytes.fromhex("0050")) == 0
+
+
+def test_art_sync_serialize():
+    assert ArtSync().serialize() == ART_NET_HEADER + bytes.fromhex("0052" "000e" "0000")
+
+
+def test_art_poll_serialize():
+    poll = ArtPoll(notify_on_change=True)
+    poll.target_port_bounds = (PortAddress(0, 0, 1), PortAddress(0, 1, 5))
+
+    assert poll.serialize() == ART_NET_HEADER + bytes.fromhex("0020" "000e" "2a" "10" "0205" "0001")
+
+
+def test_art_poll_deserialize_without_target_port_addresses():
+    poll = ArtPoll()
+    poll.deserialize(ART_NET_HEADER + bytes.fromhex("0020" "000e" "02" "10"))
+
+    assert poll.notify_on_change
+    assert not poll.targeted_mode_enabled
+
+
+def test_art_time_code_round_trip():
+    time_code = ArtTimeCode(frames=12, seconds=34, minutes=56, hours=7, type=TimeCodeType.SMPTE)
+    packet = time_code.serialize()
+    assert packet == ART_NET_HEADER + bytes.fromhex("0097" "000e" "0000" "0c" "22" "38" "07" "03")
+
+    decoded = ArtTimeCode()
+    decoded.deserialize(packet)
+    assert (decoded.frames, decoded.seconds, decoded.minutes, decoded.hours, decoded.type) == \
+           (12, 34, 56, 7, TimeCodeType.SMPTE)
+
+
+def test_art_ip_prog_reply_serialize():
+    reply = ArtIpProgReply(prog_ip=bytes([192, 168, 1, 10]), prog_subnet=bytes([255, 255, 255, 0]),
+                           prog_gateway=bytes([192, 168, 1, 1]), dhcp_enabled=True)
+
+    assert reply.serialize() == ART_NET_HEADER + bytes.fromhex(
+        "00f9" "000e" "00000000" "c0a8010a" "ffffff00" "0000" "40" "00" "c0a80101" "0000"
+    )
+
+
+def test_art_ip_prog_serialize():
+    command = ArtIpProgCommand()
+    command.enable_programming = True
+    command.program_ip_address = True
+    command.program_subnet_mask = True
+    ip_prog = ArtIpProg(command=command, prog_ip=bytes([10, 0, 0, 7]), prog_subnet=bytes([255, 0, 0, 0]),
+                        prog_gateway=bytes([10, 0, 0, 1]))
+
+    assert ip_prog.serialize() == ART_NET_HEADER + bytes.fromhex(
+        "00f8" "000e" "0000" "86" "00" "0a000007" "ff000000" "0000" "0a000001" "00000000"
+    )
+
+
+def test_art_address_serialize():
+    address = ArtAddress(net_switch=2, net_action=ValueAction.WRITE, sub_switch=3, sub_action=ValueAction.WRITE,
+                         short_name="Short", long_name="Long name",
+                         sw_in=[1, 2, 3, 4],
+                         sw_in_actions=[ValueAction.WRITE, ValueAction.IGNORE, ValueAction.RESET, ValueAction.WRITE],
+                         sw_out=[5, 6, 7, 8], sw_out_actions=[ValueAction.WRITE] * 4, acn_priority=100,
+                         command=ArtAddressCommand.AC_LED_LOCATE)
+
+    assert address.serialize() == ART_NET_HEADER + bytes.fromhex(
+        "0060" "000e" "82" "01" + "Short".encode().hex().ljust(36, "0") + "Long name".encode().hex().ljust(128, "0") +
+        "81020084" "85868788" "83" "64" "04"
+    )
+
+
+def test_art_command_serialize():
+    packet = ArtCommand(esta=0x7FF0, command="SwoutText=Playback&").serialize()
+
+    assert len(packet) == 526
+    assert packet[:14] == ART_NET_HEADER + bytes.fromhex("0024" "000e" "7ff0")
+    assert packet[14:] == b"SwoutText=Playback&".ljust(512, b"\0")
+
+
+def test_art_trigger_serialize():
+    payload = bytearray(512)
+    payload[0] = 1
+    payload[511] = 0xFF
+    packet = ArtTrigger(key=1, sub_key=5, payload=payload).serialize()
+
+    assert len(packet) == 530
+    assert packet[:18] == ART_NET_HEADER + bytes.fromhex("0099" "000e" "0000" "ffff" "01" "05")
+    assert packet[18:] == payload
+
+
+def test_art_diag_data_serialize():
+    diag_data = ArtDiagData(diag_priority=DiagnosticsPriority.DP_HIGH, logical_port=2, text="hi")
+
+    assert diag_data.serialize() == ART_NET_HEADER + bytes.fromhex("0023" "000e" "00" "80" "02" "00" "0002" "686900")
+
+
+def test_art_poll_reply_round_trip():
+    reply = ArtPollReply(source_ip=bytes([192, 168, 1, 10]), net_switch=1, sub_switch=2, short_name="Node",
+                         long_name="Long node", node_report="#0001 [0001] ok",
+                         ports=[Port(output=True, sw_out=3)], bind_index=1)
+    packet = reply.serialize()
+
+    assert len(packet) == 239
+    assert packet[:18] == ART_NET_HEADER + bytes.fromhex("0021" "c0a8010a" "3619" "0000")
+    assert packet[ArtPollReply.SOURCE_IP_OFFSET:ArtPollReply.SOURCE_IP_OFFSET + 4] == bytes([192, 168, 1, 10])
+    assert packet[ArtPollReply.BIND_INDEX_OFFSET] == 1
+
+    decoded = ArtPollReply()
+    assert decoded.deserialize(packet) == 239
+    assert decoded.source_ip == bytes([192, 168, 1, 10])
+    assert decoded.port == 0x1936
+    assert (decoded.net_switch, decoded.sub_switch) == (1, 2)
+    assert decoded.short_name == "Node"
+    assert decoded.long_name == "Long node"
+    assert decoded.node_report == "#0001 [0001] ok"
+    assert decoded.ports[0].output
+    assert decoded.ports[0].sw_out == 3
+    assert not decoded.ports[1].output
+    assert decoded.bind_index == 1
+
+
+def test_art_poll_reply_patch_node_report():
+    packet = ArtPollReply(node_report="#0001 [0001] a much longer report").serialize()
+    ArtPollReply.patch_node_report(packet, "#0001 [0002] ok")
+
+    assert packet == ArtPollReply(node_report="#0001 [0002] ok").serialize()
+
+
+def test_art_poll_reply_decodes_names():
+    packet = ArtPollReply(short_name="Node").serialize()
+    ArtPollReply.patch_node_report(packet, "")
+    long_name = ArtPollReply.NODE_REPORT_OFFSET - 64
+    packet[long_name:long_name + 8] = "Mühle\0x".encode("utf8")
+
+    decoded = ArtPollReply()
+    decoded.deserialize(packet)
+
+    assert decoded.short_name == "Node"
+    assert decoded.long_name == "Mühle"
+    assert decoded.node_report == ""
+
+
+def test_art_poll_reply_shares_names_but_not_node_reports():
+    first, second = ArtPollReply(), ArtPollReply()
+    first.deserialize(ArtPollReply(short_name="Node", node_report="#0001 [0001] ok").serialize())
+    second.deserialize(ArtPollReply(short_name="Node", node_report="#0001 [0002] ok").serialize())
+
+    assert first.short_name is second.short_name
+    assert (first.node_report, second.node_report) == ("#0001 [0001] ok", "#0001 [0002] ok")
+
+
+def test_art_dmx_deserialize_views_into_packet():
+    packet = bytearray(ArtDmx(data=bytearray([1, 2, 3, 4])).serialize())
+    dmx = ArtDmx()
+    dmx.deserialize(memoryview(packet))
+    kept = dmx.copy()
+
+    packet[ArtDmx.DATA_OFFSET] = 0xFF
+
+    assert bytes(dmx.data) == bytes([0xFF, 2, 3, 4])
+    assert kept.data == bytes([1, 2, 3, 4])
+
+
+def test_port_address_is_interned_and_immutable():
+    port_address = PortAddress(1, 2, 3)
+
+    assert PortAddress(1, 2, 3) is port_address
+    assert PortAddress.parse(port_address.port_address) is port_address
+    assert PortAddress(0, 0, 0x1FF) < PortAddress(0, 1, 0) < PortAddress(1, 0, 0)
+    with pytest.raises(AttributeError):
+        port_address.universe = 4
@@ -0,0 +1,54 @@
+from custom_components.artnet_led.client import PortAddress
+from custom_components.artnet_led.client.port_ranges import PortRanges
+
+
+def port_ranges(*universes: int) -> PortRanges:
+    ranges = PortRanges()
+    for universe in universes:
+        ranges.add(PortAddress(0, 0, universe))
+    return ranges
+
+
+def test_ranges_merge_contiguous_port_addresses():
+    ranges = port_ranges(5, 1, 3, 2, 9)
+
+    assert [[str(port_address) for port_address in run] for run in ranges.ranges()] == \
+           [["0:0:1", "0:0:2", "0:0:3"], ["0:0:5"], ["0:0:9"]]
+    assert ranges.bounds() == (PortAddress(0, 0, 1), PortAddress(0, 0, 9))
+    assert len(ranges) == 5
+
+
+def test_remove_splits_range():
+    ranges = port_ranges(1, 2, 3)
+    ranges.remove(PortAddress(0, 0, 2))
+
+    assert [len(run) for run in ranges.ranges()] == [1, 1]
+    assert PortAddress(0, 0, 2) not in ranges
+    assert PortAddress(0, 0, 3) in ranges
+
+
+def test_overlaps_is_exact_for_sparse_port_addresses():
+    ranges = port_ranges(1, 100)
+
+    assert ranges.overlaps(PortAddress(0, 0, 0), PortAddress(0, 0, 1))
+    assert ranges.overlaps(PortAddress(0, 0, 50), PortAddress(0, 1, 0))
+    assert not ranges.overlaps(PortAddress(0, 0, 10), PortAddress(0, 0, 20))
+    assert not ranges.overlaps(PortAddress(0, 0, 101), PortAddress(1, 0, 0))
+    assert not PortRanges().overlaps(PortAddress(0, 0, 0), PortAddress(1, 0, 0))
+
+
+def test_groups_merge_ranges_across_small_gaps():
+    ranges = port_ranges(1, 2, 5, 40, 41, 100)
+
+    assert [[port_address.universe for port_address in group] for group in ranges.groups(16, 8)] == \
+           [[1, 2, 5], [40, 41], [100]]
+    assert [len(group) for group in ranges.groups(0, 8)] == [2, 1, 2, 1]
+    assert list(PortRanges().groups(16, 8)) == []
+
+
+def test_groups_split_only_at_widest_gaps_when_capped():
+    ranges = port_ranges(0, 30, 100, 200, 260)
+
+    assert [[port_address.universe for port_address in group] for group in ranges.groups(16, 3)] == \
+           [[0, 30], [100], [200, 260]]
+    assert [len(group) for group in ranges.groups(16, 1)] == [5]
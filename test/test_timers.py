@@ -0,0 +1,175 @@
+from custom_components.artnet_led.client.timers import Timers
+
+
+class FakeHandle:
+    def __init__(self, when, callback):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeLoop:
+    """Just enough of an event loop for Timers, with a clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.handles: list[FakeHandle] = []
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback):
+        handle = FakeHandle(when, callback)
+        self.handles.append(handle)
+        return handle
+
+    def pending(self) -> list[FakeHandle]:
+        return [handle for handle in self.handles if not handle.cancelled]
+
+    def advance(self, seconds):
+        self.now += seconds
+        while True:
+            due = [handle for handle in self.pending() if handle.when <= self.now]
+            if not due:
+                return
+            handle = min(due, key=lambda h: h.when)
+            self.handles.remove(handle)
+            handle.callback()
+
+
+def test_schedule_replaces_deadline_of_key():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    timers.schedule("a", 1.0, fired.append, "first")
+    timers.schedule("a", 2.0, fired.append, "second")
+    assert len(timers) == 1
+    assert timers.deadline("a") == 2.0
+
+    loop.advance(1.5)
+    assert fired == []
+
+    loop.advance(1.0)
+    assert fired == ["second"]
+    assert "a" not in timers
+
+
+def test_earlier_deadline_rearms_single_handle():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    timers.schedule("late", 5.0, fired.append, "late")
+    timers.schedule("early", 1.0, fired.append, "early")
+    assert [handle.when for handle in loop.pending()] == [1.0]
+
+    loop.advance(10)
+    assert fired == ["early", "late"]
+    assert loop.pending() == []
+
+
+def test_cancel():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    timers.schedule("a", 1.0, fired.append, "a")
+    timers.schedule("b", 2.0, fired.append, "b")
+    timers.cancel("a")
+    timers.cancel("missing")
+    assert "a" not in timers
+    assert timers.deadline("a") is None
+
+    loop.advance(3)
+    assert fired == ["b"]
+
+
+def test_compact_drops_cancelled_entries():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    for i in range(100):
+        timers.schedule("a", 1.0 + i, fired.append, i)
+    assert len(timers) == 1
+    assert len(timers._heap) <= 2 * len(timers) + 16
+
+    loop.advance(200)
+    assert fired == [99]
+
+
+def test_callback_can_reschedule_its_own_key():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    def tick():
+        fired.append(loop.time())
+        if len(fired) < 3:
+            timers.schedule("tick", loop.time() + 1.0, tick)
+
+    timers.schedule("tick", 1.0, tick)
+    loop.advance(1.0)
+    loop.advance(1.0)
+    loop.advance(1.0)
+    loop.advance(1.0)
+
+    assert fired == [1.0, 2.0, 3.0]
+    assert "tick" not in timers
+
+
+def test_failing_callback_does_not_stop_others():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    timers.schedule("bad", 1.0, lambda: 1 / 0)
+    timers.schedule("good", 1.0, fired.append, "good")
+    loop.advance(1.0)
+
+    assert fired == ["good"]
+
+
+def test_clear():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    timers.schedule("a", 1.0, fired.append, "a")
+    timers.schedule("b", 2.0, fired.append, "b")
+    timers.clear()
+    assert len(timers) == 0
+    assert loop.pending() == []
+
+    timers.schedule("c", 3.0, fired.append, "c")
+    loop.advance(5)
+    assert fired == ["c"]
+
+
+def test_rescheduling_callback_that_compacts_during_run():
+    loop = FakeLoop()
+    timers = Timers(loop)
+    fired = []
+
+    def reschedule(key):
+        fired.append((loop.time(), key))
+        if len(fired) <= 2:
+            # Enough cancelled entries for this schedule to compact the heap, while other entries are still due
+            for i in range(20):
+                timers.schedule(("filler", i), 100.0 + i, fired.append, "filler")
+                timers.cancel(("filler", i))
+            timers.schedule(key, loop.time() + 1.0, reschedule, key)
+
+    timers.schedule("a", 1.0, reschedule, "a")
+    timers.schedule("b", 1.0, reschedule, "b")
+    timers.schedule("c", 3.0, reschedule, "c")
+    loop.advance(1.0)
+    loop.advance(1.0)
+    loop.advance(1.0)
+
+    assert fired == [(1.0, "a"), (1.0, "b"), (2.0, "a"), (2.0, "b"), (3.0, "c")]
+    assert len(timers) == 0